@@ -5,12 +5,64 @@ FIXED VERSION - Better PyInstaller detection
 CROSS-PLATFORM - Supports Windows and macOS
 """
 
+import hashlib
+import functools
+import importlib.metadata
+import json
+import mmap
 import os
 import platform
 import shutil
+import stat
 import subprocess
 import sys
+import tarfile
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Results of expensive checks, keyed on the (mtime, size) of their input files
+BUILD_CACHE_FILE = Path('.build_cache.json')
+
+# Build layout, relative to auth/ where the script runs
+BUILD_DIR = Path('build')
+DIST_DIR = Path('dist')
+SYSTEM_CONF_PATH = Path('../system_conf.json')
+MODEL_PATH = Path('../model/yolov8n.pt')
+DEFAULT_SALT_MARKER = b'YOUR_SECRET_SALT_HERE_CHANGE_THIS'
+
+# Package files worth deflating; the executable and model are already compressed
+COMPRESSIBLE_SUFFIXES = {'.txt', '.json', '.md'}
+TAR_GZ_COMPRESSLEVEL = 1
+
+APP_NAME = 'CrowdMonitor'
+
+# Linux ioctl that makes a copy-on-write clone of a file (Btrfs, XFS)
+FICLONE = 0x40049409
+
+# Setting this to 1 is equivalent to passing --force
+FORCE_ENV_VAR = 'CROWDMONITOR_BUILD_FORCE'
+
+# Run PyInstaller as a module of this interpreter so PATH doesn't matter
+PYINSTALLER_CMD = (sys.executable, '-m', 'PyInstaller')
+SPEC_FILE = 'crowd_monitor_protected.spec'
+
+# Rule printed above and below banners
+BANNER_RULE = '=' * 60
+
+# Held-back PyInstaller INFO lines kept to show when a build fails
+BUILD_LOG_TAIL_LINES = 200
+
+# Customer READMEs, one per platform, copied into the package as-is
+README_TEMPLATE_DIR = Path(__file__).resolve().parent / 'readme_templates'
 
 
 def get_platform_info():
@@ -29,59 +81,170 @@ def get_platform_info():
     }
 
 
+def _pyinstaller_missing():
+    """Print PyInstaller install hints"""
+    sys.stdout.write(
+        "\nPyInstaller not found.\n"
+        "Install with: pip install pyinstaller\n"
+        "\nOr if already installed, try:\n"
+        "  python -m pip install --user pyinstaller\n"
+    )
+
+
 def check_dependencies():
     """Check if required packages are installed"""
     plat = get_platform_info()
     print(f"Checking dependencies on {plat['system']}...")
     print(f"Platform: {plat['system']}")
 
+    # Importing PyInstaller is far cheaper than spawning an interpreter and
+    # proves what build_executable() needs: that this Python can run it. The
+    # subprocess probe is only a fallback (e.g. a broken import hook), and it is
+    # started now so the interpreter spawn overlaps the tkinter import below
+    probe = None
+    try:
+        import PyInstaller
+        version = PyInstaller.__version__
+    except ImportError:
+        try:
+            probe = subprocess.Popen(
+                [*PYINSTALLER_CMD, '--version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except OSError as e:
+            print(f"  ✗ pyinstaller - MISSING ({e})")
+            _pyinstaller_missing()
+            return False
+
     # Check tkinter
     try:
         import tkinter
         print(f"  ✓ tkinter")
     except ImportError:
+        if probe is not None:
+            probe.kill()
+            probe.wait()
         print(f"  ✗ tkinter - MISSING")
         print("\ntkinter is required but not available.")
         return False
 
+    if probe is None:
+        print(f"  ✓ pyinstaller (version: {version})")
+        return True
+
     # Check pyinstaller using subprocess (works even if not in Python path)
     try:
-        result = subprocess.run(
-            [sys.executable, '-m', 'PyInstaller', '--version'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print(f"  ✓ pyinstaller (version: {version})")
-            return True
-        else:
-            print(f"  ✗ pyinstaller - MISSING")
-            print(f"\nPyInstaller not found.")
-            print("Install with: pip install pyinstaller")
-            print("\nOr if already installed, try:")
-            print("  python -m pip install --user pyinstaller")
-            return False
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
+        stdout, _ = probe.communicate(timeout=5)
+    except subprocess.TimeoutExpired as e:
+        probe.kill()
+        probe.communicate()
         print(f"  ✗ pyinstaller - MISSING ({e})")
-        print(f"\nPyInstaller not found.")
-        print("Install with: pip install pyinstaller")
-        print("\nOr if already installed, try:")
-        print("  python -m pip install --user pyinstaller")
+        _pyinstaller_missing()
         return False
 
+    if probe.returncode == 0:
+        print(f"  ✓ pyinstaller (version: {stdout.strip()})")
+        return True
 
-def verify_secret_salt():
-    """Verify that secret salt has been changed"""
-    print("\nVerifying secret salt...")
+    print(f"  ✗ pyinstaller - MISSING")
+    _pyinstaller_missing()
+    return False
+
+
+def _load_build_cache():
+    """Load the build cache, treating a missing or corrupt file as empty"""
+    try:
+        with open(BUILD_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_build_cache(cache):
+    """Persist the build cache; failures only cost a re-check next run"""
+    # Write beside the cache and swap it in, so readers never see a partial file
+    tmp_file = BUILD_CACHE_FILE.with_name(f'{BUILD_CACHE_FILE.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_file, BUILD_CACHE_FILE)
+    except OSError:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+
+def _file_contains(path, marker):
+    """
+    Check whether a file contains a byte string without reading it into memory.
+
+    Args:
+        path: File to search
+        marker: Bytes to look for
+
+    Returns:
+        True if the marker occurs in the file
+    """
+    with open(path, 'rb') as f:
+        try:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap cannot map an empty file
+            return False
+        with m:
+            return m.find(marker) != -1
+
+
+def _has_default_salt(path, use_cache=True):
+    """
+    Check a source file for the default secret salt, reusing the cached
+    answer while the file's mtime and size are unchanged.
+
+    Args:
+        path: Path to license_manager.py
+        use_cache: Read a previous answer from the build cache
+
+    Returns:
+        True if the default salt placeholder is still present
+    """
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    stamp = [st.st_mtime_ns, st.st_size]
+
+    cache = _load_build_cache()
+    entry = cache.get('secret_salt', {}).get(key)
+    if use_cache and entry and entry.get('stamp') == stamp:
+        return entry['default_salt']
+
+    found = _file_contains(path, DEFAULT_SALT_MARKER)
+    cache.setdefault('secret_salt', {})[key] = {'stamp': stamp, 'default_salt': found}
+    _save_build_cache(cache)
+    return found
+
+
+def verify_secret_salt(force=False, use_cache=True):
+    """
+    Verify that secret salt has been changed
+
+    Args:
+        force: Continue past the default salt without prompting (unattended builds)
+        use_cache: Reuse the cached result for an unchanged license_manager.py
 
-    with open('license_manager.py', 'r') as f:
-        content = f.read()
+    Returns:
+        True if the build should continue
+    """
+    print("\nVerifying secret salt...")
 
-    if 'YOUR_SECRET_SALT_HERE_CHANGE_THIS' in content:
+    if _has_default_salt('license_manager.py', use_cache):
         print("  ✗ WARNING: Default secret salt detected!")
-        print("  Please change the secret_salt in license_manager.py")
+        print("  Please change _SECRET_SALT in license_manager.py")
+        if force:
+            print("  Continuing anyway (--force)")
+            return True
         response = input("  Continue anyway? (y/n): ")
         if response.lower() != 'y':
             return False
@@ -91,43 +254,130 @@ def verify_secret_salt():
     return True
 
 
-def clean_build():
-    """Clean previous build artifacts"""
+def _fast_rmtree(path):
+    """
+    Remove a directory tree with one scandir pass per directory.
+
+    DirEntry caches the file type from the directory listing, so unlike
+    shutil.rmtree no extra lstat is issued per entry. Symlinks are unlinked,
+    never followed.
+
+    Args:
+        path: Directory to remove
+    """
+    # Depth-first: a directory is removed once all of its children are gone
+    stack = [(os.fspath(path), False)]
+    while stack:
+        current, scanned = stack.pop()
+        if scanned:
+            os.rmdir(current)
+            continue
+        stack.append((current, True))
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                else:
+                    os.unlink(entry.path)
+
+
+def _find_pycache_dirs():
+    """__pycache__ folders under auth/, not descending into PyInstaller's build/dist"""
+    found = []
+    for root, dirs, _ in os.walk('.'):
+        if root == '.':
+            dirs[:] = [d for d in dirs if d not in (BUILD_DIR.name, DIST_DIR.name)]
+        if '__pycache__' in dirs:
+            dirs.remove('__pycache__')
+            found.append(Path(root, '__pycache__'))
+    return found
+
+
+def _remove_path(path):
+    """
+    Remove a file or directory tree.
+
+    Args:
+        path: Path to remove
+
+    Returns:
+        'dir' or 'file' for what was removed, or None if it didn't exist
+    """
+    is_dir = path.is_dir() and not path.is_symlink()
+    # Attempt the removal directly; a missing path costs no extra stat
+    try:
+        if is_dir:
+            _fast_rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        return None
+    return 'dir' if is_dir else 'file'
+
+
+def clean_build(fresh=False):
+    """
+    Clean previous build artifacts
+
+    Args:
+        fresh: Also remove build/ and dist/ entirely. By default PyInstaller's
+            analysis cache in build/ is kept so rebuilds are incremental, and
+            only the previous CrowdMonitor output is removed from dist/.
+    """
     print("\nCleaning previous builds...")
 
-    dirs_to_remove = ['build', 'dist', '__pycache__']
+    if fresh:
+        targets = [BUILD_DIR, DIST_DIR]
+    else:
+        targets = sorted(DIST_DIR.glob(f'{APP_NAME}*')) if DIST_DIR.is_dir() else []
+    targets += _find_pycache_dirs()
 
-    for dir_name in dirs_to_remove:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
-            print(f"  Removed {dir_name}/")
+    # Removals are independent and I/O-bound, so they overlap on a small pool
+    if targets:
+        with ThreadPoolExecutor(max_workers=min(4, len(targets))) as executor:
+            removed = list(executor.map(_remove_path, targets))
+        for path, kind in zip(targets, removed):
+            if kind is not None:
+                print(f"  Removed {path.as_posix()}{'/' if kind == 'dir' else ''}")
 
     print("  ✓ Cleanup complete")
 
 
-def build_executable():
-    """Build the executable using PyInstaller"""
+@functools.lru_cache(maxsize=1)
+def _has_spec_file():
+    """Whether the PyInstaller spec file is present (checked once per run)"""
+    return os.path.isfile(SPEC_FILE)
+
+
+def build_executable(fresh=False, verbose=False):
+    """
+    Build the executable using PyInstaller
+
+    Args:
+        fresh: Pass --clean so PyInstaller discards its cache and re-analyzes everything
+        verbose: Show PyInstaller's INFO log lines as well as warnings and errors
+
+    Returns:
+        True if PyInstaller succeeded
+    """
     print("\nBuilding executable...")
 
     plat = get_platform_info()
 
-    # Check if spec file exists
-    spec_file = 'crowd_monitor_protected.spec'
-
-    if os.path.exists(spec_file):
-        print(f"  Using {spec_file}")
+    if _has_spec_file():
+        print(f"  Using {SPEC_FILE}")
         print(f"  Note: Spec file includes proper pkg_resources handling for DeepSort")
         # Use python -m PyInstaller to ensure it's found
-        cmd = [sys.executable, '-m', 'PyInstaller', spec_file, '--clean']
+        cmd = [*PYINSTALLER_CMD, SPEC_FILE, '--noconfirm']
     else:
         print("  Using direct PyInstaller command")
 
         # Build platform-specific command
         cmd = [
-            sys.executable, '-m', 'PyInstaller',
+            *PYINSTALLER_CMD,
             '--onefile',
-            '--name', 'CrowdMonitor',
-            '--clean',
+            '--name', APP_NAME,
+            '--noconfirm',
             '--add-data', f'license_manager.py{plat["separator"]}.',
             '--hidden-import', 'license_manager',
             # Don't exclude pkg_resources - DeepSort needs it
@@ -135,8 +385,7 @@ def build_executable():
         ]
 
         # Add system_conf.json if it exists
-        system_conf_path = Path('../system_conf.json')
-        if system_conf_path.exists():
+        if SYSTEM_CONF_PATH.is_file():
             cmd.extend(['--add-data', f'../system_conf.json{plat["separator"]}.'])
             print(f"  Including system_conf.json in build")
 
@@ -152,309 +401,494 @@ def build_executable():
         # Add the main script
         cmd.append('../config_gui.py')  # Assuming we're in auth/ folder
 
-    try:
-        print(f"  Running: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    if fresh:
+        cmd.append('--clean')
+
+    print(f"  Running: {' '.join(cmd)}")
+    sys.stdout.flush()
+    # Forward the log live; routine INFO lines are held back (unless verbose)
+    # and only their most recent tail is kept to give context on failure
+    tail = deque(maxlen=BUILD_LOG_TAIL_LINES)
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True, bufsize=1) as proc:
+        for line in proc.stdout:
+            if verbose or ' INFO: ' not in line:
+                sys.stdout.write(line)
+            else:
+                tail.append(line)
+
+    if proc.returncode == 0:
         print("  ✓ Build successful")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"  ✗ Build failed:")
-        print(e.stderr)
-        return False
 
+    print(f"  ✗ Build failed:")
+    if tail:
+        print("  Last PyInstaller log lines:")
+        sys.stdout.write(''.join(tail))
+    return False
 
-def create_distribution_package():
-    """Create a distribution package"""
-    print("\nCreating distribution package...")
-
-    plat = get_platform_info()
 
-    dist_dir = Path('dist')
-    if not dist_dir.exists():
-        print("  ✗ dist/ directory not found")
-        return False
+def _find_executable(plat, dist_dir):
+    """
+    Locate the built executable in dist/ for the current platform.
 
-    # Find the executable based on platform
-    exe_file = None
+    Args:
+        plat: Platform info from get_platform_info()
+        dist_dir: PyInstaller output directory
 
+    Returns:
+        Path to the executable (or .app bundle), or None if not found
+    """
+    # PyInstaller names the output after --name, so probe those paths first
+    # and scan the directory only if it was renamed
     if plat['is_windows']:
-        # Look for .exe files on Windows
-        exe_files = list(dist_dir.glob('*.exe'))
-        if exe_files:
-            exe_file = exe_files[0]
-    elif plat['is_mac']:
-        # Look for .app bundles or executables without extension on macOS
-        app_bundles = list(dist_dir.glob('*.app'))
-        if app_bundles:
-            exe_file = app_bundles[0]
-        else:
-            # Look for executable files without extension
-            for item in dist_dir.iterdir():
-                if item.is_file() and os.access(item, os.X_OK) and not item.suffix:
-                    exe_file = item
-                    break
+        exe_file = dist_dir / f'{APP_NAME}.exe'
+        if exe_file.is_file():
+            return exe_file
     else:
-        # Linux or other Unix-like systems
-        for item in dist_dir.iterdir():
-            if item.is_file() and os.access(item, os.X_OK):
-                exe_file = item
-                break
-
-    if not exe_file:
-        print(f"  ✗ No executable found in dist/ for {plat['system']}")
+        if plat['is_mac']:
+            app_bundle = dist_dir / f'{APP_NAME}.app'
+            if app_bundle.is_dir():
+                return app_bundle
+        exe_file = dist_dir / APP_NAME
+        try:
+            mode = os.stat(exe_file).st_mode
+        except OSError:
+            mode = 0
+        if stat.S_ISREG(mode) and mode & 0o111:
+            return exe_file
+
+    # One directory read; DirEntry carries the file type, so only executable
+    # candidates on Unix-like systems cost a stat
+    unix_exe = None
+    with os.scandir(dist_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if plat['is_windows']:
+                if name.endswith('.exe'):
+                    return Path(entry.path)
+            elif plat['is_mac'] and name.endswith('.app') and entry.is_dir(follow_symlinks=False):
+                # .app bundles take precedence over bare executables
+                return Path(entry.path)
+            elif (unix_exe is None and entry.is_file()
+                  and not (plat['is_mac'] and os.path.splitext(name)[1])
+                  and entry.stat().st_mode & 0o111):
+                unix_exe = Path(entry.path)
+                if not plat['is_mac']:
+                    return unix_exe
+
+    return unix_exe
+
+
+def _file_digest(path):
+    """blake2b digest of a file, streamed so large executables aren't loaded whole"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'blake2b').hexdigest()
+
+
+def _build_cache_key():
+    """
+    Hash everything the PyInstaller output depends on.
+
+    Covers the spec file, the application and auth sources that get bundled,
+    system_conf.json, requirements.txt, the Python version and every installed
+    distribution's version (the equivalent of a pip freeze), so upgrading
+    ultralytics, torch or opencv invalidates the cached executable.
+
+    Returns:
+        Hex digest identifying the current build inputs
+    """
+    try:
+        pyinstaller_version = importlib.metadata.version('pyinstaller')
+    except importlib.metadata.PackageNotFoundError:
+        pyinstaller_version = ''
+
+    key = hashlib.blake2b()
+    key.update(f'{sys.version}|{platform.system()}|{pyinstaller_version}'.encode())
+    installed = sorted(f"{dist.metadata['Name']}=={dist.version}"
+                       for dist in importlib.metadata.distributions())
+    key.update('\n'.join(installed).encode())
+
+    inputs = sorted(Path('..').glob('*.py')) + sorted(Path('.').glob('*.py'))
+    inputs += [Path(SPEC_FILE), SYSTEM_CONF_PATH, Path('..') / 'requirements.txt']
+    for path in inputs:
+        if path.is_file():
+            key.update(path.as_posix().encode())
+            key.update(_file_digest(path).encode())
+    return key.hexdigest()
+
+
+def _cached_build_is_current(build_key, cache):
+    """
+    Check whether dist/ holds the executable from a build with the same inputs.
+
+    Args:
+        build_key: Key from _build_cache_key()
+        cache: Build cache contents from _load_build_cache()
+
+    Returns:
+        True if the recorded key matches and the executable is unmodified
+    """
+    entry = cache.get('pyinstaller')
+    if not entry or entry.get('key') != build_key:
         return False
 
-    print(f"  Found: {exe_file.name}")
+    exe_file = Path(entry.get('executable', ''))
+    return exe_file.is_file() and _file_digest(exe_file) == entry.get('digest')
 
-    # Create distribution folder
-    package_name = f'CrowdMonitor_Package_{plat["system"]}'
-    package_dir = Path(package_name)
-    if package_dir.exists():
-        shutil.rmtree(package_dir)
-    package_dir.mkdir()
 
-    # Copy executable (handle .app bundles differently)
-    if exe_file.suffix == '.app':
-        # Copy entire .app bundle
-        shutil.copytree(exe_file, package_dir / exe_file.name)
-    else:
-        shutil.copy(exe_file, package_dir / exe_file.name)
-        # On Unix-like systems, ensure executable permission
-        if not plat['is_windows']:
-            os.chmod(package_dir / exe_file.name, 0o755)
-
-    # Copy YOLO model file if it exists
-    model_path = Path('../model/yolov8n.pt')
-    if model_path.exists():
-        # Create model directory in package
-        model_dir = package_dir / 'model'
-        model_dir.mkdir(exist_ok=True)
-        shutil.copy(model_path, model_dir / 'yolov8n.pt')
-        print(f"  Copied model file: yolov8n.pt")
-    else:
-        print(f"  ⚠ Warning: YOLO model not found at {model_path}")
-        print(f"    Customers will need to provide their own model file")
+def _probe_build_cache(cache, use_cache=True):
+    """
+    Hash the build inputs and check them against the cached build.
 
-    # Copy system_conf.json if it exists
-    system_conf_path = Path('../system_conf.json')
-    if system_conf_path.exists():
-        shutil.copy(system_conf_path, package_dir / 'system_conf.json')
-        print(f"  Copied configuration file: system_conf.json")
-    else:
-        print(f"  ⚠ Warning: system_conf.json not found (using defaults)")
+    Args:
+        cache: Build cache contents, loaded by the caller so this can run on a
+            worker thread while the main thread updates the cache file
+        use_cache: When False only the key is computed
 
-    # Create platform-specific README for customers
-    if plat['is_windows']:
-        readme_content = """# CrowdMonitor Installation Guide (Windows)
-
-## Installation
-
-1. Extract all files from this folder to a location on your computer
-2. The folder should contain:
-   - CrowdMonitor.exe
-   - model/yolov8n.pt (YOLO model file)
-3. Run CrowdMonitor.exe
-
-## First Run
-
-On first run, you will be prompted to activate with a license key.
-
-1. Click "Request License" to see your Machine ID
-2. Send your Machine ID to support@yourcompany.com
-3. Paste the license key you receive
-4. Click "Activate"
-
-## License Information
-
-- Your license is tied to this computer
-- If you upgrade your hardware, contact support for a new license
-- Check license status: Click "License Info" button in the application
-
-## System Requirements
+    Returns:
+        Tuple of (build key, whether dist/ can be reused)
+    """
+    build_key = _build_cache_key()
+    return build_key, use_cache and _cached_build_is_current(build_key, cache)
 
-- Windows 10 or later
-- Webcam or video file for monitoring
-- YOLO model file included (model/yolov8n.pt)
 
-## Model File
+def _record_build(build_key):
+    """
+    Remember the executable produced for a set of build inputs.
 
-The application includes a pre-trained YOLOv8n model for person detection.
-Default location: model/yolov8n.pt
-
-If you need to use a different model:
-1. Open the application
-2. Go to "Video Source" tab
-3. Click "Browse" next to "Model Path"
-4. Select your custom .pt model file
-
-## Support
-
-Email: support@yourcompany.com
-Website: www.yourcompany.com
-
-## Troubleshooting
+    Args:
+        build_key: Key from _build_cache_key()
+    """
+    exe_file = _find_executable(get_platform_info(), DIST_DIR) if DIST_DIR.is_dir() else None
+    cache = _load_build_cache()
+    # .app bundles are directories; they are rebuilt rather than hashed
+    if exe_file is None or not exe_file.is_file():
+        cache.pop('pyinstaller', None)
+    else:
+        cache['pyinstaller'] = {
+            'key': build_key,
+            'executable': exe_file.as_posix(),
+            'digest': _file_digest(exe_file),
+        }
+    _save_build_cache(cache)
+
+
+def _discard_dir(path):
+    """
+    Get a directory out of the way without waiting for its contents to be deleted.
+
+    The directory is renamed aside (an O(1) metadata operation) and removed on a
+    background thread. The thread is non-daemon, so the interpreter waits for it
+    before exiting and no half-deleted folder is left behind.
+
+    Args:
+        path: Directory to discard (may not exist)
+    """
+    old = path.with_name(f'{path.name}.old-{os.getpid()}')
+    try:
+        os.replace(path, old)
+    except FileNotFoundError:
+        return
+    except OSError:
+        # Rename refused (e.g. a file in it is open on Windows); delete in place
+        shutil.rmtree(path)
+        return
+
+    threading.Thread(target=shutil.rmtree, args=(old,), kwargs={'ignore_errors': True},
+                     name=f'discard-{path.name}').start()
+
+
+def _fast_copy(src, dst):
+    """
+    Copy a file, cloning it instead of duplicating its bytes where supported.
+
+    Copy-on-write clones (APFS, Btrfs, XFS) are O(1) regardless of size. On
+    Linux the FICLONE ioctl is tried first, then copy_file_range (in-kernel,
+    and reflinking on some filesystems); macOS uses ``cp -c`` (clonefile).
+    Anything else falls back to shutil.copy. Permission bits are preserved
+    like shutil.copy.
+
+    Args:
+        src: Source file
+        dst: Destination file path
+    """
+    system = platform.system()
+    if system == 'Darwin':
+        if subprocess.run(['cp', '-c', os.fspath(src), os.fspath(dst)],
+                          stderr=subprocess.DEVNULL).returncode == 0:
+            return
+    elif system == 'Linux' and fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                try:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                except OSError:
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy(src, dst)
+
+
+def _copy_bundle(src, dst):
+    """
+    Copy a directory tree such as a macOS .app bundle.
+
+    Args:
+        src: Source directory
+        dst: Destination directory (must not exist)
+    """
+    # cp -cR clones the whole bundle on APFS in one call
+    if platform.system() == 'Darwin' and subprocess.run(
+            ['cp', '-cR', os.fspath(src), os.fspath(dst)],
+            stderr=subprocess.DEVNULL).returncode == 0:
+        return
+    # shutil.copy keeps the permission bits the bundle needs but skips
+    # copy2's timestamp/metadata syscalls
+    shutil.copytree(src, dst, copy_function=shutil.copy)
+
+
+def _link_or_copy(src, dst):
+    """
+    Hardlink a file into the package, copying when linking isn't possible.
+
+    A hardlink is a metadata-only operation, so the multi-hundred-MB
+    executable is not read and rewritten. Linking fails across volumes or
+    on filesystems without hardlink support; those fall back to a copy.
+
+    Args:
+        src: Source file
+        dst: Destination path (must not exist)
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
 
-**License activation fails:**
-- Verify you copied the entire license key
-- Check your internet connection (if using online validation)
-- Contact support with your Machine ID
 
-**Application won't start:**
-- Ensure the model folder with yolov8n.pt exists
-- Check that your video source (camera/file) is accessible
-- Run as Administrator if necessary
+def _package_executable(exe_file, dst, make_executable):
+    """
+    Place the executable (or .app bundle) into the package folder.
 
-**"Model not found" error:**
-- Verify model/yolov8n.pt exists in the same folder as the executable
-- Browse for the model file manually in the Video Source tab
-"""
+    Args:
+        exe_file: Executable or .app bundle in dist/
+        dst: Destination path in the package folder
+        make_executable: Ensure the executable permission (Unix-like systems)
+    """
+    if exe_file.suffix == '.app':
+        # Copy entire .app bundle
+        _copy_bundle(exe_file, dst)
+    else:
+        _link_or_copy(exe_file, dst)
+        if make_executable:
+            os.chmod(dst, 0o755)
+
+
+def _write_zip(archive_path, package_dir):
+    """
+    Zip a package folder, storing already-compressed payloads as-is.
+
+    PyInstaller executables and .pt model files are compressed archives
+    themselves, so deflating them costs CPU for no size gain.
+
+    Args:
+        archive_path: Output .zip path
+        package_dir: Folder whose contents become the archive root
+    """
+    package_dir = Path(package_dir)
+    with zipfile.ZipFile(archive_path, 'w', allowZip64=True) as z:
+        for path in sorted(package_dir.rglob('*')):
+            if not path.is_file():
+                continue
+            if path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                z.write(path, path.relative_to(package_dir).as_posix(),
+                        compress_type=zipfile.ZIP_DEFLATED, compresslevel=6)
+            else:
+                z.write(path, path.relative_to(package_dir).as_posix(),
+                        compress_type=zipfile.ZIP_STORED)
+
+
+def _readme_template(plat):
+    """
+    Pick the customer README for the current platform.
+
+    Args:
+        plat: Platform info from get_platform_info()
+
+    Returns:
+        Path to the README template
+    """
+    if plat['is_windows']:
+        name = 'Windows'
     elif plat['is_mac']:
-        readme_content = """# CrowdMonitor Installation Guide (macOS)
-
-## Installation
-
-1. Extract all files from this folder to a location on your computer
-2. The folder should contain:
-   - CrowdMonitor.app (or CrowdMonitor executable)
-   - model/yolov8n.pt (YOLO model file)
-3. Double-click CrowdMonitor.app (or run CrowdMonitor executable)
-
-## First Run
-
-On first run, you may need to allow the application to run:
-1. If macOS blocks the app, go to System Preferences → Security & Privacy
-2. Click "Open Anyway" to allow CrowdMonitor to run
-
-You will be prompted to activate with a license key:
-1. Click "Request License" to see your Machine ID
-2. Send your Machine ID to support@yourcompany.com
-3. Paste the license key you receive
-4. Click "Activate"
-
-## License Information
-
-- Your license is tied to this computer
-- If you upgrade your hardware, contact support for a new license
-- Check license status: Click "License Info" button in the application
-
-## System Requirements
-
-- macOS 10.13 (High Sierra) or later
-- Webcam or video file for monitoring
-- YOLO model file included (model/yolov8n.pt)
-
-## Model File
-
-The application includes a pre-trained YOLOv8n model for person detection.
-Default location: model/yolov8n.pt
-
-If you need to use a different model:
-1. Open the application
-2. Go to "Video Source" tab
-3. Click "Browse" next to "Model Path"
-4. Select your custom .pt model file
-
-## Permissions
-
-The application may request permission to:
-- Access your camera (for live monitoring)
-- Access files (for video file monitoring)
+        name = 'macOS'
+    else:
+        name = 'Linux'
+    return README_TEMPLATE_DIR / f'README_{name}.txt'
 
-## Support
 
-Email: support@yourcompany.com
-Website: www.yourcompany.com
+def _package_key(exe_file, readme_path, archive_path):
+    """
+    Identify the inputs of a distribution archive without reading them.
 
-## Troubleshooting
+    The executable, README, model and config are identified by
+    (mtime, size), which changes whenever they are rebuilt or edited.
 
-**License activation fails:**
-- Verify you copied the entire license key
-- Check your internet connection (if using online validation)
-- Contact support with your Machine ID
+    Args:
+        exe_file: Packaged executable
+        readme_path: README template copied into the package
+        archive_path: Archive being produced
 
-**Application won't start:**
-- Right-click the app and select "Open" instead of double-clicking
-- Ensure the model folder with yolov8n.pt exists
-- Check that your video source (camera/file) is accessible
-- Check System Preferences → Security & Privacy for blocked apps
+    Returns:
+        Hex digest, or None when the package can't be keyed (.app bundles)
+    """
+    if not exe_file.is_file():
+        return None
 
-**"App is damaged" error:**
-- This is a Gatekeeper issue. Run this command in Terminal:
-  xattr -cr /path/to/CrowdMonitor.app
+    key = hashlib.blake2b(archive_path.encode(), digest_size=16)
+    for path in (exe_file, readme_path, MODEL_PATH, SYSTEM_CONF_PATH):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            key.update(b'-')
+            continue
+        key.update(f'|{path.as_posix()}|{st.st_mtime_ns}|{st.st_size}'.encode())
+    return key.hexdigest()
 
-**"Model not found" error:**
-- Verify model/yolov8n.pt exists in the same folder as the application
-- Browse for the model file manually in the Video Source tab
-"""
-    else:
-        readme_content = """# CrowdMonitor Installation Guide (Linux)
 
-## Installation
+def _archive_stamp(archive_path):
+    """(mtime, size) of an archive, or None if it doesn't exist"""
+    try:
+        st = os.stat(archive_path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
 
-1. Extract all files from this folder to a location on your computer
-2. The folder should contain:
-   - CrowdMonitor (executable)
-   - model/yolov8n.pt (YOLO model file)
-3. Make the executable runnable: chmod +x CrowdMonitor
-4. Run: ./CrowdMonitor
 
-## First Run
+def _write_tar_gz(archive_path, package_dir):
+    """
+    Tar and gzip a package folder at a fast compression level.
 
-On first run, you will be prompted to activate with a license key.
+    gzip can't store members uncompressed, and nearly all of the payload (the
+    executable and model) is already compressed, so level 1 gives essentially
+    the same size as shutil.make_archive's level 9 in a fraction of the time.
 
-1. Click "Request License" to see your Machine ID
-2. Send your Machine ID to support@yourcompany.com
-3. Paste the license key you receive
-4. Click "Activate"
+    Args:
+        archive_path: Output .tar.gz path
+        package_dir: Folder whose contents become the archive root
+    """
+    with tarfile.open(archive_path, 'w:gz', compresslevel=TAR_GZ_COMPRESSLEVEL) as tar:
+        tar.add(package_dir, arcname='.')
 
-## License Information
 
-- Your license is tied to this computer
-- If you upgrade your hardware, contact support for a new license
-- Check license status: Click "License Info" button in the application
+def create_distribution_package(use_cache=True):
+    """
+    Create a distribution package
 
-## System Requirements
+    Args:
+        use_cache: Keep the existing archive when none of its inputs changed
 
-- Modern Linux distribution
-- Webcam or video file for monitoring
-- YOLO model file included (model/yolov8n.pt)
+    Returns:
+        True if the package and archive are in place
+    """
+    print("\nCreating distribution package...")
 
-## Model File
+    plat = get_platform_info()
 
-The application includes a pre-trained YOLOv8n model for person detection.
-Default location: model/yolov8n.pt
+    if not DIST_DIR.is_dir():
+        print("  ✗ dist/ directory not found")
+        return False
 
-If you need to use a different model:
-1. Open the application
-2. Go to "Video Source" tab
-3. Click "Browse" next to "Model Path"
-4. Select your custom .pt model file
+    exe_file = _find_executable(plat, DIST_DIR)
 
-## Support
+    if not exe_file:
+        print(f"  ✗ No executable found in dist/ for {plat['system']}")
+        return False
 
-Email: support@yourcompany.com
-Website: www.yourcompany.com
+    print(f"  Found: {exe_file.name}")
 
-## Troubleshooting
+    # Create distribution folder
+    package_name = f'CrowdMonitor_Package_{plat["system"]}'
+    package_dir = Path(package_name)
+    _discard_dir(package_dir)
+    package_dir.mkdir()
 
-**"Model not found" error:**
-- Verify model/yolov8n.pt exists in the same folder as the executable
-- Browse for the model file manually in the Video Source tab
-"""
+    # Create platform-specific README for customers
+    readme_path = _readme_template(plat)
+
+    # The copies and the README write touch disjoint files, so they run
+    # concurrently; messages are printed afterwards to keep them in order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        jobs = [executor.submit(_package_executable, exe_file, package_dir / exe_file.name,
+                                not plat['is_windows'])]
+
+        # Copy YOLO model file if it exists
+        has_model = MODEL_PATH.is_file()
+        if has_model:
+            # Create model directory in package
+            model_dir = package_dir / 'model'
+            model_dir.mkdir(exist_ok=True)
+            jobs.append(executor.submit(_link_or_copy, MODEL_PATH, model_dir / 'yolov8n.pt'))
+
+        # Copy system_conf.json if it exists (contents only; metadata isn't needed)
+        has_system_conf = SYSTEM_CONF_PATH.is_file()
+        if has_system_conf:
+            jobs.append(executor.submit(shutil.copyfile, SYSTEM_CONF_PATH,
+                                        package_dir / 'system_conf.json'))
+
+        jobs.append(executor.submit(shutil.copyfile, readme_path, package_dir / 'README.txt'))
+
+        # Re-raise the first failure
+        for job in jobs:
+            job.result()
+
+    if has_model:
+        print(f"  Copied model file: yolov8n.pt")
+    else:
+        print(f"  ⚠ Warning: YOLO model not found at {MODEL_PATH}")
+        print(f"    Customers will need to provide their own model file")
 
-    with open(package_dir / 'README.txt', 'w') as f:
-        f.write(readme_content)
+    if has_system_conf:
+        print(f"  Copied configuration file: system_conf.json")
+    else:
+        print(f"  ⚠ Warning: system_conf.json not found (using defaults)")
 
     # Create archive (ZIP for Windows, tar.gz for Unix-like systems)
     archive_name = f'CrowdMonitor_Distribution_{plat["system"]}'
+    archive_ext = '.zip' if plat['is_windows'] else '.tar.gz'
+    archive_path = f'{archive_name}{archive_ext}'
+
+    # Re-archiving hundreds of MB is the slow part; skip it when nothing changed
+    package_key = _package_key(exe_file, readme_path, archive_path)
+    cache = _load_build_cache()
+    entry = cache.get('package', {}).get(archive_path)
+    if (use_cache and package_key is not None and entry
+            and entry.get('key') == package_key
+            and entry.get('stamp') == _archive_stamp(archive_path)):
+        print(f"  ✓ Distribution package unchanged: {archive_path}")
+        print(f"  ✓ Package contents in: {package_dir}/")
+        return True
+
     if plat['is_windows']:
-        shutil.make_archive(archive_name, 'zip', package_dir)
-        archive_ext = '.zip'
+        _write_zip(archive_path, package_dir)
     else:
-        shutil.make_archive(archive_name, 'gztar', package_dir)
-        archive_ext = '.tar.gz'
+        _write_tar_gz(archive_path, package_dir)
 
-    print(f"  ✓ Distribution package created: {archive_name}{archive_ext}")
+    if package_key is not None:
+        cache.setdefault('package', {})[archive_path] = {
+            'key': package_key,
+            'stamp': _archive_stamp(archive_path),
+        }
+        _save_build_cache(cache)
+
+    print(f"  ✓ Distribution package created: {archive_path}")
     print(f"  ✓ Package contents in: {package_dir}/")
 
     return True
@@ -463,59 +897,109 @@ Website: www.yourcompany.com
 def display_summary():
     """Display build summary and next steps"""
     plat = get_platform_info()
-    
-    print("\n" + "=" * 60)
-    print("BUILD COMPLETE!")
-    print("=" * 60)
 
-    print(f"\nBuilt for: {plat['system']}")
-    print("\nFiles created:")
+    # Collected and written once: one console write instead of dozens
+    lines = ["\n" + BANNER_RULE]
+    lines.append("BUILD COMPLETE!")
+    lines.append(BANNER_RULE)
+
+    lines.append(f"\nBuilt for: {plat['system']}")
+    lines.append("\nFiles created:")
 
     if plat['is_windows']:
-        print("  • dist/CrowdMonitor.exe - Protected executable")
-        print("  • CrowdMonitor_Distribution_Windows.zip - Customer package")
-        print("  • CrowdMonitor_Package_Windows/ - Unzipped package folder")
+        lines.append("  • dist/CrowdMonitor.exe - Protected executable")
+        lines.append("  • CrowdMonitor_Distribution_Windows.zip - Customer package")
+        lines.append("  • CrowdMonitor_Package_Windows/ - Unzipped package folder")
         test_platform = "Windows machine"
     elif plat['is_mac']:
-        print("  • dist/CrowdMonitor.app (or CrowdMonitor) - Protected executable")
-        print("  • CrowdMonitor_Distribution_Darwin.tar.gz - Customer package")
-        print("  • CrowdMonitor_Package_Darwin/ - Unzipped package folder")
+        lines.append("  • dist/CrowdMonitor.app (or CrowdMonitor) - Protected executable")
+        lines.append("  • CrowdMonitor_Distribution_Darwin.tar.gz - Customer package")
+        lines.append("  • CrowdMonitor_Package_Darwin/ - Unzipped package folder")
         test_platform = "Mac"
     else:
-        print("  • dist/CrowdMonitor - Protected executable")
-        print("  • CrowdMonitor_Distribution_Linux.tar.gz - Customer package")
-        print("  • CrowdMonitor_Package_Linux/ - Unzipped package folder")
+        lines.append("  • dist/CrowdMonitor - Protected executable")
+        lines.append("  • CrowdMonitor_Distribution_Linux.tar.gz - Customer package")
+        lines.append("  • CrowdMonitor_Package_Linux/ - Unzipped package folder")
         test_platform = "Linux machine"
 
-    print("\nNext steps:")
-    print(f"  1. Test the executable on a clean {test_platform}")
-    print("     - Verify DeepSort tracker works (if enabled)")
-    print("  2. Generate licenses using license_generator_tool.py")
-    print(f"  3. Distribute the package to customers")
+    lines.append("\nNext steps:")
+    lines.append(f"  1. Test the executable on a clean {test_platform}")
+    lines.append("     - Verify DeepSort tracker works (if enabled)")
+    lines.append("  2. Generate licenses using license_generator_tool.py")
+    lines.append(f"  3. Distribute the package to customers")
 
-    print("\nRemember:")
-    print("  • Keep your secret_salt private and secure")
-    print("  • Maintain a database of issued licenses")
-    print("  • Provide good customer support for license issues")
-    print("  • DeepSort tracker is included and working (pkg_resources properly bundled)")
+    lines.append("\nRemember:")
+    lines.append("  • Keep _SECRET_SALT (license_manager.py) private and secure")
+    lines.append("  • Maintain a database of issued licenses")
+    lines.append("  • Provide good customer support for license issues")
+    lines.append("  • DeepSort tracker is included and working (pkg_resources properly bundled)")
 
     if plat['is_mac']:
-        print("\nMac-specific notes:")
-        print("  • Users may need to allow the app in Security & Privacy settings")
-        print("  • Consider code signing for easier distribution (requires Apple Developer account)")
-        print("  • For .app bundles, users should not extract individual files")
+        lines.append("\nMac-specific notes:")
+        lines.append("  • Users may need to allow the app in Security & Privacy settings")
+        lines.append("  • Consider code signing for easier distribution (requires Apple Developer account)")
+        lines.append("  • For .app bundles, users should not extract individual files")
+
+    lines.append("\n" + BANNER_RULE)
+
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+
+def parse_arguments(argv=None):
+    """
+    Parse build options.
 
-    print("\n" + "=" * 60)
+    Args:
+        argv: Arguments to parse (defaults to sys.argv[1:])
+
+    Returns:
+        Namespace with force, skip_salt_check, no_cache, fresh and verbose
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # CI sets the environment variable; a bare run never builds a parser
+    env_force = os.environ.get(FORCE_ENV_VAR) == '1'
+    if not argv:
+        return SimpleNamespace(force=env_force, skip_salt_check=False, no_cache=False, fresh=False,
+                               verbose=False)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the protected CrowdMonitor executable")
+    parser.add_argument("--force", action="store_true",
+                        help=f"Never prompt; continue past warnings (or set {FORCE_ENV_VAR}=1)")
+    parser.add_argument("--skip-salt-check", action="store_true",
+                        help="Skip the secret salt verification")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore cached check results and always rebuild")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Delete build/ and dist/ and rebuild from scratch (PyInstaller --clean)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show PyInstaller's full log, not just warnings and errors")
+
+    args = parser.parse_args(argv)
+    args.force = args.force or env_force
+    return args
 
 
 def main():
     """Main build process"""
+    args = parse_arguments()
     plat = get_platform_info()
     
-    print("=" * 60)
+    print(BANNER_RULE)
     print("CROWD MONITOR - PROTECTED BUILD SCRIPT")
     print(f"Building for: {plat['system']}")
-    print("=" * 60)
+    print(BANNER_RULE)
+
+    # Hashing sources and dist/ for the build cache is silent I/O, so it runs
+    # while the checks below print and possibly prompt. Cleaning has to wait:
+    # it depends on the checks passing and on the cache result.
+    executor = ThreadPoolExecutor(max_workers=1)
+    build_cache_probe = executor.submit(_probe_build_cache, _load_build_cache(),
+                                        not (args.no_cache or args.fresh))
+    executor.shutdown(wait=False)
 
     # Step 1: Check dependencies
     if not check_dependencies():
@@ -528,19 +1012,27 @@ def main():
         sys.exit(1)
 
     # Step 2: Verify secret salt
-    if not verify_secret_salt():
+    if args.skip_salt_check:
+        print("\nSkipping secret salt verification (--skip-salt-check)")
+    elif not verify_secret_salt(force=args.force, use_cache=not args.no_cache):
         sys.exit(1)
 
-    # Step 3: Clean previous builds
-    clean_build()
+    # Steps 3-4: Reuse dist/ when no build input changed, else clean and rebuild
+    build_key, build_is_cached = build_cache_probe.result()
+    if build_is_cached:
+        print("\nBuilding executable...")
+        print("  ✓ Using cached build (sources unchanged)")
+    else:
+        clean_build(fresh=args.fresh)
+
+        if not build_executable(fresh=args.fresh, verbose=args.verbose):
+            print("\n✗ Build failed. Please check errors above.")
+            sys.exit(1)
 
-    # Step 4: Build executable
-    if not build_executable():
-        print("\n✗ Build failed. Please check errors above.")
-        sys.exit(1)
+        _record_build(build_key)
 
     # Step 5: Create distribution package
-    if not create_distribution_package():
+    if not create_distribution_package(use_cache=not args.no_cache):
         print("\n✗ Package creation failed.")
         sys.exit(1)
 
@@ -3,14 +3,11 @@ License Generation Tool (ADMIN ONLY) - FIXED VERSION WITH MAC BINDING
 Use this to generate license keys for customers
 """
 
-import hashlib
-import hmac
-import json
 import tkinter as tk
 from datetime import datetime, timedelta
 from tkinter import ttk, messagebox, scrolledtext
 
-from license_manager import LicenseManager
+from license_manager import LicenseManager, dumps_license
 
 
 class LicenseGeneratorGUI:
@@ -132,12 +129,12 @@ class LicenseGeneratorGUI:
                 'valid': True
             }
 
-            # Generate signature using the SAME method as LicenseManager
-            signature = self._generate_signature(license_data)
+            # Sign with LicenseManager so generator and validator can never drift apart
+            signature = self.manager.generate_signature(license_data)
             license_data['signature'] = signature
 
             # Convert to JSON
-            license_json = json.dumps(license_data, indent=2)
+            license_json = dumps_license(license_data)
 
             # Display the license
             self.output_text.delete(1.0, tk.END)
@@ -165,20 +162,6 @@ IMPORTANT:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate license: {e}")
 
-    def _generate_signature(self, data):
-        """Generate HMAC signature - MUST match LicenseManager.generate_signature()"""
-        # Remove signature if present
-        data_copy = {k: v for k, v in data.items() if k != 'signature'}
-
-        # Use same method as LicenseManager
-        data_str = json.dumps(data_copy, sort_keys=True)
-        signature = hmac.new(
-            self.manager.secret_salt,
-            data_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
-
     def _copy_to_clipboard(self):
         """Copy license to clipboard"""
         license_text = self.output_text.get(1.0, tk.END).strip()
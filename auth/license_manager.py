@@ -3,16 +3,99 @@ License Management System with Hardware-Tied Authentication
 FIXED VERSION - Supports optional license_file parameter for flexibility
 """
 
+import functools
 import hashlib
 import hmac
 import json
 import os
 import platform
-import tkinter as tk
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from tkinter import messagebox, scrolledtext
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+# IMPORTANT: Change this secret salt before distribution!
+# This is used to sign licenses and prevent forgery
+_SECRET_SALT = b"xK9mP2vQ8nL5rT7wY4uE1jH6fD3sA0zC"
+
+# Canonical form that signatures are computed over. Built once: json.dumps()
+# constructs a new encoder on every call that passes options like sort_keys.
+# Must stay byte-identical to json.dumps(data, sort_keys=True) so existing
+# licenses keep validating.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
+SECONDS_PER_DAY = 86400
+SIGNATURE_FIELD = 'signature'
+
+
+def _canonical_bytes(data):
+    """
+    Serialize license fields to the exact bytes that are signed.
+
+    Every field except the signature is signed, so licenses carrying extra
+    fields keep validating. The filtered copy is only made when a signature
+    is actually present (i.e. when verifying a loaded license).
+
+    Args:
+        data: License dictionary
+
+    Returns:
+        UTF-8 bytes of the sorted-key JSON
+    """
+    if SIGNATURE_FIELD in data:
+        data = {k: v for k, v in data.items() if k != SIGNATURE_FIELD}
+    return _CANONICAL_ENCODER.encode(data).encode()
+
+
+def _hmac_pad_states(key):
+    """
+    Prehash the HMAC-SHA256 inner and outer key pads (RFC 2104).
+
+    Copying these states per message skips the two key-block compressions
+    hmac.new() would repeat; the resulting MAC is identical to hmac.new(key, msg, sha256).
+
+    Args:
+        key: HMAC key bytes
+
+    Returns:
+        Tuple of (inner, outer) sha256 objects to copy for each message
+    """
+    block_size = hashlib.sha256().block_size
+    if len(key) > block_size:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(block_size, b'\0')
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+    return inner, outer
+
+
+def dumps_license(license_data):
+    """
+    Format a license for display and saving (2-space indented JSON).
+
+    Uses orjson when installed, falling back to the json module. Only the
+    presentation differs (orjson writes non-ASCII as UTF-8 instead of \\u
+    escapes); signatures are always computed over the stdlib's canonical
+    sort_keys form, so either output validates.
+
+    Args:
+        license_data: License dictionary including its signature
+
+    Returns:
+        License JSON text
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(license_data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(license_data, indent=2)
 
 
 class LicenseManager:
@@ -26,9 +109,8 @@ class LicenseManager:
             license_file: Optional custom path for license file.
                          If not provided, uses default location in user home directory.
         """
-        # IMPORTANT: Change this secret salt before distribution!
-        # This is used to sign licenses and prevent forgery
-        self.secret_salt = b"xK9mP2vQ8nL5rT7wY4uE1jH6fD3sA0zC"
+        # Kept as an attribute for callers that sign outside this class
+        self.secret_salt = _SECRET_SALT
 
         # License file location
         if license_file:
@@ -41,17 +123,42 @@ class LicenseManager:
         # Ensure parent directory exists
         self.license_file.parent.mkdir(parents=True, exist_ok=True)
 
+        # HMAC key schedule run once; each signature copies the prehashed pad states
+        self._hmac_inner, self._hmac_outer = _hmac_pad_states(_SECRET_SALT)
+
+        # Last successful validation: ((mtime_ns, size) of the license file, expiry POSIX time)
+        self._validate_cache = None
+
     def get_mac_address(self):
         """Get the MAC address of the primary network interface"""
-        mac = uuid.getnode()
-        mac_str = ':'.join(('%012X' % mac)[i:i + 2] for i in range(0, 12, 2))
-        return mac_str
+        return self._mac_address
 
     def get_machine_id(self):
-        """Generate a unique machine identifier"""
-        mac = self.get_mac_address()
+        """Get the unique machine identifier"""
+        return self._machine_id
+
+    # Identity values are fixed for the life of the process and computed on first use,
+    # so a cached validation or an info-only lookup never probes the network interfaces
+    @functools.cached_property
+    def _mac_address(self):
+        """MAC address of the primary network interface"""
+        mac = uuid.getnode()
+        return '%02X:%02X:%02X:%02X:%02X:%02X' % (
+            (mac >> 40) & 0xFF, (mac >> 32) & 0xFF, (mac >> 24) & 0xFF,
+            (mac >> 16) & 0xFF, (mac >> 8) & 0xFF, mac & 0xFF,
+        )
+
+    @functools.cached_property
+    def _username(self):
+        """Login name from the environment, or None if unset"""
+        return os.getenv('USERNAME') or os.getenv('USER')
+
+    @functools.cached_property
+    def _machine_id(self):
+        """Unique machine identifier"""
+        mac = self._mac_address
         hostname = platform.node()
-        username = os.getenv('USERNAME') or os.getenv('USER') or 'unknown'
+        username = self._username or 'unknown'
 
         # Combine multiple hardware identifiers
         machine_string = f"{mac}-{hostname}-{username}".encode()
@@ -60,19 +167,42 @@ class LicenseManager:
         return machine_id
 
     def generate_signature(self, data):
-        """Generate HMAC signature for license data"""
-        data_str = json.dumps(data, sort_keys=True)
-        signature = hmac.new(
-            self.secret_salt,
-            data_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        """
+        Generate HMAC signature for license data
+
+        Args:
+            data: License fields; a 'signature' entry, if present, is not signed
+
+        Returns:
+            Hex HMAC-SHA256 signature
+        """
+        return self._signature_digest(data).hex()
+
+    def _signature_digest(self, data):
+        """Raw 32-byte HMAC-SHA256 of the signed license fields"""
+        inner = self._hmac_inner.copy()
+        inner.update(_canonical_bytes(data))
+        outer = self._hmac_outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
 
     def verify_signature(self, data, signature):
-        """Verify HMAC signature"""
-        expected = self.generate_signature(data)
-        return hmac.compare_digest(expected, signature)
+        """
+        Verify HMAC signature
+
+        Args:
+            data: License fields
+            signature: Hex signature stored in the license
+
+        Returns:
+            True if the signature matches
+        """
+        # Compare raw digests: half the bytes of the hex strings, and no hex encode of our side
+        try:
+            provided = bytes.fromhex(signature)
+        except (ValueError, TypeError):
+            return False
+        return hmac.compare_digest(self._signature_digest(data), provided)
 
     def generate_license(self, machine_id, validity_days=365, customer_name=""):
         """Generate a new license for a specific machine"""
@@ -82,7 +212,7 @@ class LicenseManager:
         license_data = {
             'machine_id': machine_id,
             'mac_address': self.get_mac_address(),
-            'username': os.getenv('USERNAME') or os.getenv('USER'),
+            'username': self._username,
             'customer_name': customer_name,
             'created': now.isoformat(),
             'expires': expires.isoformat(),
@@ -93,12 +223,50 @@ class LicenseManager:
         signature = self.generate_signature(license_data)
         license_data['signature'] = signature
 
-        return json.dumps(license_data, indent=2)
+        return dumps_license(license_data)
+
+    def generate_licenses(self, batch):
+        """
+        Generate many licenses in one pass
+
+        Args:
+            batch: Iterable of (machine_id, validity_days, customer_name) tuples
+
+        Returns:
+            List of license JSON strings, in the order of the batch
+        """
+        # Shared per batch: issue time, bound identity and the prehashed HMAC pad states
+        now = datetime.now()
+        created = now.isoformat()
+        mac_address = self.get_mac_address()
+        username = self._username
+        inner_proto = self._hmac_inner
+        outer_proto = self._hmac_outer
+
+        licenses = []
+        for machine_id, validity_days, customer_name in batch:
+            license_data = {
+                'machine_id': machine_id,
+                'mac_address': mac_address,
+                'username': username,
+                'customer_name': customer_name,
+                'created': created,
+                'expires': (now + timedelta(days=validity_days)).isoformat(),
+                'valid': True
+            }
+            inner = inner_proto.copy()
+            inner.update(_canonical_bytes(license_data))
+            outer = outer_proto.copy()
+            outer.update(inner.digest())
+            license_data[SIGNATURE_FIELD] = outer.hexdigest()
+            licenses.append(dumps_license(license_data))
+
+        return licenses
 
     def save_license(self, license_json):
         """Save license to local file"""
         try:
-            with open(self.license_file, 'w') as f:
+            with open(self.license_file, 'w', encoding='utf-8') as f:
                 f.write(license_json)
             return True
         except Exception as e:
@@ -107,45 +275,97 @@ class LicenseManager:
 
     def load_license(self):
         """Load license from local file"""
-        if not self.license_file.exists():
-            return None
-
         try:
-            with open(self.license_file, 'r') as f:
-                return json.load(f)
+            # json.loads detects UTF-8 itself; reading bytes skips the text-decoding layer
+            with open(self.license_file, 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"Error loading license: {e}")
             return None
 
     def validate_license(self):
         """Validate the current license"""
+        stamp = self._license_stamp()
+        cached = self._cached_validation(stamp)
+        if cached is not None:
+            return cached
+
         license_data = self.load_license()
 
         if not license_data:
             return False, "No license found"
 
+        return self._validate_loaded(license_data, stamp)
+
+    def _license_stamp(self):
+        """(mtime_ns, size) of the license file, or None if it cannot be stat'ed"""
+        try:
+            st = self.license_file.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _cached_validation(self, stamp):
+        """
+        Reuse the last successful validation while the license file is unchanged
+
+        An unchanged file that validated before only needs the expiry re-checked.
+
+        Args:
+            stamp: Current stamp from _license_stamp()
+
+        Returns:
+            (True, message) on a cache hit, otherwise None (and the cache is cleared)
+        """
+        if stamp is not None and self._validate_cache is not None:
+            cached_stamp, expires_ts = self._validate_cache
+            remaining = expires_ts - time.time()
+            if cached_stamp == stamp and remaining >= 0:
+                return True, f"License valid ({int(remaining // SECONDS_PER_DAY)} days remaining)"
+        self._validate_cache = None
+        return None
+
+    def _validate_loaded(self, license_data, stamp):
+        """Fully validate loaded license data, caching a success against the file stamp"""
+        valid, message, expires_ts = self._validate_dict(license_data)
+        if valid and stamp is not None:
+            self._validate_cache = (stamp, expires_ts)
+        return valid, message
+
+    def _validate_dict(self, license_data):
+        """
+        Run the signature, machine, expiry and revocation checks on parsed license data
+
+        Args:
+            license_data: License dictionary including its signature
+
+        Returns:
+            Tuple of (valid, message, expiry POSIX time or None when invalid)
+        """
         # Verify signature
-        signature = license_data.pop('signature', None)
+        signature = license_data.get(SIGNATURE_FIELD)
         if not signature or not self.verify_signature(license_data, signature):
-            return False, "Invalid license signature"
+            return False, "Invalid license signature", None
 
         # Check machine ID
         current_machine_id = self.get_machine_id()
         if license_data.get('machine_id') != current_machine_id:
-            return False, "License is for a different machine"
+            return False, "License is for a different machine", None
 
         # Check expiration
         expires = datetime.fromisoformat(license_data.get('expires'))
         if datetime.now() > expires:
-            return False, "License has expired"
+            return False, "License has expired", None
 
         # Check valid flag
         if not license_data.get('valid', False):
-            return False, "License has been revoked"
+            return False, "License has been revoked", None
 
         # All checks passed
         days_remaining = (expires - datetime.now()).days
-        return True, f"License valid ({days_remaining} days remaining)"
+        return True, f"License valid ({days_remaining} days remaining)", expires.timestamp()
 
     def get_license_info(self):
         """Get detailed license information"""
@@ -154,19 +374,44 @@ class LicenseManager:
         if not license_data:
             return None
 
+        return self._license_info(license_data)
+
+    def get_status(self):
+        """
+        Get license information and validation status from a single file read
+
+        Returns:
+            Tuple of (info dict or None, (valid, message))
+        """
+        stamp = self._license_stamp()
+        license_data = self.load_license()
+
+        if not license_data:
+            return None, (False, "No license found")
+
+        # Shares validate_license's stat-keyed cache so both entry points agree
+        status = self._cached_validation(stamp) or self._validate_loaded(license_data, stamp)
+        return self._license_info(license_data), status
+
+    @staticmethod
+    def _license_info(license_data):
+        """Summarize parsed license data for display"""
+        get = license_data.get
+        expires_str = get('expires')
+
         # Calculate days remaining
         try:
-            expires = datetime.fromisoformat(license_data.get('expires'))
+            expires = datetime.fromisoformat(expires_str)
             days_remaining = (expires - datetime.now()).days
         except (ValueError, TypeError):
             days_remaining = 0
 
         return {
-            'customer_name': license_data.get('customer_name', 'N/A'),
-            'created': license_data.get('created'),
-            'expires': license_data.get('expires'),
-            'machine_id': license_data.get('machine_id'),
-            'valid': license_data.get('valid', False),
+            'customer_name': get('customer_name', 'N/A'),
+            'created': get('created'),
+            'expires': expires_str,
+            'machine_id': get('machine_id'),
+            'valid': get('valid', False),
             'days_remaining': days_remaining
         }
 
@@ -177,6 +422,10 @@ class LicenseManager:
         Args:
             parent: Optional parent window for modal dialog
         """
+        # Tk is only needed here; headless validation never loads it
+        import tkinter as tk
+        from tkinter import messagebox, scrolledtext
+
         # Create root or use parent
         if parent:
             root = tk.Toplevel(parent)
@@ -229,7 +478,9 @@ class LicenseManager:
         # Get machine info
         mac_address = self.get_mac_address()
         machine_id = self.get_machine_id()
-        username = os.getenv('USERNAME') or os.getenv('USER') or 'unknown'
+        username = self._username or 'unknown'
+        expected_identity = (machine_id, mac_address.upper(), username)
+        identity_labels = ("Machine ID", "MAC Address", "Username")
 
         # MAC Address
         mac_label = tk.Label(
@@ -328,47 +579,34 @@ class LicenseManager:
                 # Parse and save license
                 license_data = json.loads(license_key)
 
-                # Verify it's for this machine
-                if license_data.get('machine_id') != machine_id:
-                    messagebox.showerror(
-                        "Error",
-                        "This license is for a different machine.\n\n"
-                        f"Expected Machine ID: {machine_id}\n"
-                        f"License Machine ID: {license_data.get('machine_id')}"
-                    )
-                    return
-
-                # Verify MAC address
-                if license_data.get('mac_address', '').upper() != mac_address.upper():
-                    messagebox.showerror(
-                        "Error",
-                        "This license is for a different MAC address.\n\n"
-                        f"Your MAC Address: {mac_address}\n"
-                        f"License MAC Address: {license_data.get('mac_address')}"
-                    )
-                    return
-
-                # Verify username
-                if license_data.get('username') != username:
+                # Verify it's for this machine, MAC address and username in one comparison
+                licensed = (
+                    license_data.get('machine_id'),
+                    license_data.get('mac_address', '').upper(),
+                    license_data.get('username'),
+                )
+                if licensed != expected_identity:
+                    mismatched = [
+                        f"{label}\n  Yours: {ours}\n  License: {theirs}"
+                        for label, ours, theirs in zip(identity_labels, expected_identity, licensed)
+                        if ours != theirs
+                    ]
                     messagebox.showerror(
                         "Error",
-                        "This license is for a different username.\n\n"
-                        f"Your Username: {username}\n"
-                        f"License Username: {license_data.get('username')}"
+                        "This license is for a different machine.\n\n" + "\n\n".join(mismatched)
                     )
                     return
 
-                # Save license
-                with open(self.license_file, 'w') as f:
-                    f.write(license_key)
-
-                # Validate
-                valid, message = self.validate_license()
+                # Validate the pasted license before anything touches the disk
+                valid, message, expires_ts = self._validate_dict(license_data)
 
                 if valid:
+                    with open(self.license_file, 'w', encoding='utf-8') as f:
+                        f.write(license_key)
+                    st = self.license_file.stat()
+                    self._validate_cache = ((st.st_mtime_ns, st.st_size), expires_ts)
                     messagebox.showinfo("Success", "License activated successfully!")
                     activation_result['success'] = True
-                    root.quit()
                     root.destroy()
                 else:
                     messagebox.showerror("Error", f"License validation failed: {message}")
@@ -383,9 +621,9 @@ class LicenseManager:
 
         def show_license_info():
             """Show current license information"""
-            license_data = self.load_license()
+            info, (valid, message) = self.get_status()
 
-            if not license_data:
+            if not info:
                 messagebox.showinfo(
                     "License Information",
                     "No license found.\n\n"
@@ -393,12 +631,9 @@ class LicenseManager:
                 )
                 return
 
-            info = self.get_license_info()
             created = datetime.fromisoformat(info['created']).strftime('%Y-%m-%d %H:%M')
             expires = datetime.fromisoformat(info['expires']).strftime('%Y-%m-%d %H:%M')
 
-            valid, message = self.validate_license()
-
             info_text = f"""
 Current License Information:
 
@@ -420,7 +655,6 @@ Machine ID: {info['machine_id']}
                     "Do you want to exit?"
             ):
                 activation_result['success'] = False
-                root.quit()
                 root.destroy()
 
         # Create buttons with better styling
@@ -507,8 +741,12 @@ Machine ID: {info['machine_id']}
         root.grab_set()
         root.focus_force()
 
-        # Start main loop
-        root.mainloop()
+        # A Toplevel runs modally on the parent's event loop; only a standalone Tk needs its own.
+        # Either way, destroy() ends the wait.
+        if parent:
+            root.wait_window(root)
+        else:
+            root.mainloop()
 
         return activation_result['success']
 
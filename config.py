@@ -22,6 +22,10 @@ class MonitoringConfig:
     camera_width: int = 1280
     camera_height: int = 720
     camera_fps: int = 30
+    threaded_capture: bool = False  # Read frames on a background thread (live sources keep only the newest)
+    gpu_decode: bool = False  # Decode files/streams with NVDEC via cv2.cudacodec when available
+    gpu_render: bool = False  # Downscale frames for display on the GPU (OpenCV CUDA build required)
+    pipelined_processing: bool = False  # Detect/track on a worker thread while the previous frame renders
 
     # ==================== Grid and Spatial Settings ====================
     cell_width: float = 1.0
@@ -37,6 +41,9 @@ class MonitoringConfig:
     yolo_imgsz: int = 640
     yolo_classes: Tuple[int, ...] = (0,)  # 0 = person class
     min_model_size_bytes: int = 1000000  # 1MB minimum for valid model
+    gpu_preprocess: bool = False  # Letterbox/normalize frames on the GPU when CUDA is available
+    use_tensorrt: bool = False  # Export the model to a TensorRT engine (CUDA only) and load that instead
+    inference_threads: int = 0  # Torch CPU inference threads (0 = physical cores, i.e. logical CPUs // 2)
 
     # ==================== Tracking Settings ====================
     use_deepsort: bool = False
@@ -65,6 +72,10 @@ class MonitoringConfig:
     max_display_width: int = 1600  # Maximum display width in pixels (auto-adjusted)
     max_display_height: int = 900  # Maximum display height in pixels (auto-adjusted)
 
+    # Display cadence
+    show_window: bool = True  # False runs headless: no window, no per-frame rendering
+    render_every: int = 1  # Render and show every Nth frame (detection and alerts still run every frame)
+
     # Color scheme (BGR format for OpenCV)
     grid_color: Tuple[int, int, int] = (100, 255, 100)
     bbox_color: Tuple[int, int, int] = (0, 255, 0)
@@ -2,11 +2,14 @@
 Detection module for person detection using YOLO.
 """
 
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
+import torch
+import torch.nn.functional as F
 from ultralytics import YOLO
 
 from config import MonitoringConfig
@@ -15,6 +18,13 @@ from logger_config import get_logger
 logger = get_logger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parent
 
+# Model paths already verified or downloaded in this process
+_verified_models = set()
+
+# Ultralytics letterbox padding value (114/255) and model stride
+LETTERBOX_FILL = 114.0 / 255.0
+MODEL_STRIDE = 32
+
 
 def get_resource_path(relative_path: str) -> str:
     """
@@ -70,6 +80,9 @@ def download_yolo_model(model_name: str) -> bool:
     Returns:
         True if model is available, False otherwise
     """
+    if model_name in _verified_models:
+        return True
+
     model_path = Path(model_name)
 
     # Check if model exists and is valid
@@ -80,6 +93,7 @@ def download_yolo_model(model_name: str) -> bool:
             min_size = 1000000  # Default 1MB if not in config
             if model_path.stat().st_size > min_size:
                 logger.info(f"Using existing model: {model_name}")
+                _verified_models.add(model_name)
                 return True
             else:
                 logger.warning(f"Model file {model_name} appears corrupted (too small)")
@@ -92,6 +106,7 @@ def download_yolo_model(model_name: str) -> bool:
         # Let YOLO handle the download automatically
         YOLO(model_name)
         logger.info(f"Model {model_name} downloaded successfully")
+        _verified_models.add(model_name)
         return True
     except Exception as e:
         logger.error(f"Failed to download model {model_name}: {e}")
@@ -110,6 +125,14 @@ class PersonDetector:
         """
         self.config = config
         self.model = None
+        self._model_ready = False
+        # Class filter passed to every inference call, built once
+        self._classes = list(config.yolo_classes)
+
+        # GPU preprocessing state (see _preprocess_on_gpu)
+        self._use_gpu_preprocess = self.config.gpu_preprocess and torch.cuda.is_available()
+        self._gpu_device = torch.device('cuda') if self._use_gpu_preprocess else None
+        self._gpu_in: Optional[torch.Tensor] = None
 
     def load_model(self) -> bool:
         """
@@ -118,6 +141,9 @@ class PersonDetector:
         Returns:
             True if successful, False otherwise
         """
+        if self._model_ready:
+            return True
+
         # Resolve model path for bundled executables
         resolved_model_path = get_resource_path(self.config.model_path)
         logger.info(f"Loading YOLO model: {resolved_model_path}")
@@ -130,19 +156,25 @@ class PersonDetector:
             logger.error("Failed to download YOLO model")
             return False
 
+        self._configure_inference_threads()
+
         # Load the model with error handling
         try:
             self.model = YOLO(self.config.model_path)
             logger.info("YOLO model loaded successfully")
+            self._load_tensorrt_engine()
+            self._allocate_gpu_input()
+            self._model_ready = True
             return True
         except Exception as e:
             logger.error(f"Failed to load YOLO model: {e}")
             logger.info("Attempting to re-download model...")
 
-            # Remove corrupted model file
+            # Remove corrupted model file and forget that it was verified
             model_path = Path(self.config.model_path)
             if model_path.exists():
                 model_path.unlink()
+            _verified_models.discard(self.config.model_path)
 
             # Force re-download
             if not download_yolo_model(self.config.model_path):
@@ -151,11 +183,117 @@ class PersonDetector:
             try:
                 self.model = YOLO(self.config.model_path)
                 logger.info("YOLO model loaded successfully after re-download")
+                self._load_tensorrt_engine()
+                self._allocate_gpu_input()
+                self._model_ready = True
                 return True
             except Exception as e2:
                 logger.error(f"Failed to load YOLO model even after re-download: {e2}")
                 return False
 
+    def _configure_inference_threads(self):
+        """
+        Set the torch CPU thread pool size for inference.
+
+        The entry point pins OpenMP/BLAS pools to one thread to avoid oversubscription,
+        which would otherwise also throttle CPU inference. With inference_threads = 0
+        this uses the physical core count (torch's own default, which it can no longer
+        see once OMP_NUM_THREADS=1), approximated as half the logical CPUs.
+        """
+        if torch.cuda.is_available():
+            return
+
+        threads = self.config.inference_threads or max(1, (os.cpu_count() or 1) // 2)
+        torch.set_num_threads(threads)
+        logger.info(f"CPU inference threads: {threads}")
+
+    def _load_tensorrt_engine(self):
+        """Export the loaded model to a TensorRT engine once and switch to it (if enabled)."""
+        if not self.config.use_tensorrt:
+            return
+        if not torch.cuda.is_available():
+            logger.warning("TensorRT requested but CUDA is not available, using PyTorch model")
+            return
+
+        model_path = Path(self.config.model_path)
+        if model_path.suffix == '.engine':
+            return
+
+        engine_path = model_path.with_suffix('.engine')
+        try:
+            if not engine_path.exists():
+                logger.info(f"Exporting TensorRT engine: {engine_path}")
+                exported = self.model.export(format='engine', half=True, device=0,
+                                             imgsz=self.config.yolo_imgsz, verbose=False)
+                engine_path = Path(exported)
+
+            self.model = YOLO(str(engine_path), task='detect')
+            logger.info(f"TensorRT engine loaded: {engine_path}")
+        except Exception as e:
+            logger.warning(f"TensorRT export/load failed, using PyTorch model: {e}")
+
+    def _allocate_gpu_input(self):
+        """Allocate the persistent half-precision input tensor used for GPU preprocessing."""
+        if not self._use_gpu_preprocess:
+            return
+
+        # Network input must be a multiple of the model stride
+        size = int(np.ceil(self.config.yolo_imgsz / MODEL_STRIDE) * MODEL_STRIDE)
+        self._gpu_in = torch.empty((1, 3, size, size), dtype=torch.float16, device=self._gpu_device)
+        logger.info(f"GPU preprocessing enabled ({size}x{size} FP16 input)")
+
+    def _preprocess_on_gpu(self, frame: np.ndarray) -> Tuple[float, int, int]:
+        """
+        Letterbox a BGR frame into the persistent GPU input tensor.
+
+        Performs the same steps Ultralytics does on the CPU (resize keeping aspect
+        ratio, pad with gray, BGR->RGB, HWC->CHW, scale to [0, 1]) so the model can
+        consume the tensor directly.
+
+        Args:
+            frame: Input BGR frame (H, W, 3) uint8
+
+        Returns:
+            Tuple of (scale, pad_x, pad_y) needed to map boxes back to the frame
+        """
+        h, w = frame.shape[:2]
+        size = self._gpu_in.shape[-1]
+        scale = min(size / h, size / w)
+        new_h, new_w = int(round(h * scale)), int(round(w * scale))
+        pad_y, pad_x = (size - new_h) // 2, (size - new_w) // 2
+
+        src = torch.from_numpy(frame).to(self._gpu_device, non_blocking=True)
+        src = src.permute(2, 0, 1).flip(0).unsqueeze(0).to(torch.float16)
+        resized = F.interpolate(src, size=(new_h, new_w), mode='bilinear', align_corners=False)
+
+        self._gpu_in.fill_(LETTERBOX_FILL)
+        self._gpu_in[:, :, pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized.mul_(1.0 / 255.0)
+        return scale, pad_x, pad_y
+
+    @staticmethod
+    def _boxes_to_array(boxes, scale: float, pad_x: int, pad_y: int) -> np.ndarray:
+        """
+        Gather all result boxes into one host array with a single device transfer.
+        
+        Letterbox offsets are undone on the device before copying.
+        
+        Args:
+            boxes: Ultralytics Boxes for one result
+            scale: Letterbox scale factor (1.0 if not letterboxed)
+            pad_x: Letterbox horizontal padding in pixels
+            pad_y: Letterbox vertical padding in pixels
+            
+        Returns:
+            Array of shape (N, 5) with rows [x1, y1, x2, y2, confidence] in frame pixels
+        """
+        data = torch.cat([torch.as_tensor(boxes.xyxy).float(),
+                          torch.as_tensor(boxes.conf).float().reshape(-1, 1)], dim=1)
+        if scale != 1.0 or pad_x or pad_y:
+            data[:, 0:4:2] -= pad_x
+            data[:, 1:4:2] -= pad_y
+            data[:, :4] /= scale
+        return data.cpu().numpy()
+
     def detect_persons(self, frame: np.ndarray) -> List[List[float]]:
         """
         Detect persons in the frame using YOLO.
@@ -171,41 +309,44 @@ class PersonDetector:
             return []
 
         try:
-            results = self.model(
-                frame,
-                imgsz=self.config.yolo_imgsz,
-                conf=self.config.confidence_threshold,
-                classes=list(self.config.yolo_classes),
-                verbose=False
-            )
-
-            detections = []
+            # Boxes come back in letterboxed coordinates on the GPU path
+            scale, pad_x, pad_y = 1.0, 0, 0
+            if self._gpu_in is not None and frame.ndim == 3 and frame.shape[2] == 3:
+                scale, pad_x, pad_y = self._preprocess_on_gpu(frame)
+                results = self.model.predict(
+                    self._gpu_in,
+                    imgsz=self._gpu_in.shape[-1],
+                    conf=self.config.confidence_threshold,
+                    classes=self._classes,
+                    half=True,
+                    verbose=False
+                )
+            else:
+                results = self.model(
+                    frame,
+                    imgsz=self.config.yolo_imgsz,
+                    conf=self.config.confidence_threshold,
+                    classes=self._classes,
+                    verbose=False
+                )
+
             h_img, w_img = frame.shape[:2]
 
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    for box in result.boxes:
-                        try:
-                            xyxy = box.xyxy[0].cpu().numpy() if hasattr(box.xyxy[0], 'cpu') else np.array(box.xyxy[0])
-                            conf = float(box.conf[0].cpu().numpy()) if hasattr(box.conf[0], 'cpu') else float(
-                                box.conf[0])
-                        except Exception:
-                            continue
-
-                        x1, y1, x2, y2 = map(float, xyxy)
-                        x1 = max(0, min(w_img - 1, x1))
-                        x2 = max(0, min(w_img - 1, x2))
-                        y1 = max(0, min(h_img - 1, y1))
-                        y2 = max(0, min(h_img - 1, y2))
-
-                        if x2 <= x1 or y2 <= y1:
-                            continue
-
-                        area = (x2 - x1) * (y2 - y1)
-                        if area < self.config.min_bbox_area:
-                            continue
-
-                        detections.append([x1, y1, x2, y2, conf])
+            batches = [self._boxes_to_array(result.boxes, scale, pad_x, pad_y)
+                       for result in results
+                       if getattr(result, 'boxes', None) is not None and len(result.boxes)]
+            if not batches:
+                logger.debug("Detected 0 persons")
+                return []
+
+            # Clip to the frame and drop empty or too-small boxes, all rows at once
+            data = np.concatenate(batches).astype(np.float64)
+            np.clip(data[:, 0:4:2], 0, w_img - 1, out=data[:, 0:4:2])
+            np.clip(data[:, 1:4:2], 0, h_img - 1, out=data[:, 1:4:2])
+            width = data[:, 2] - data[:, 0]
+            height = data[:, 3] - data[:, 1]
+            keep = (width > 0) & (height > 0) & (width * height >= self.config.min_bbox_area)
+            detections = data[keep].tolist()
 
             logger.debug(f"Detected {len(detections)} persons")
             return detections
@@ -0,0 +1,21 @@
+"""
+Frame rate helpers shared by the renderer and the WebSocket sender.
+"""
+
+from typing import Sequence
+
+
+def compute_fps(timestamps: Sequence[float]) -> float:
+    """
+    Frame rate over a rolling window of frame timestamps, in constant time.
+
+    Args:
+        timestamps: Frame timestamps in seconds, oldest first (e.g. a bounded deque)
+
+    Returns:
+        Frames per second, or 0.0 with fewer than two samples
+    """
+    if len(timestamps) < 2:
+        return 0.0
+    elapsed = timestamps[-1] - timestamps[0]
+    return (len(timestamps) - 1) / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,279 @@
+"""
+Threaded frame capture module.
+Decouples blocking VideoCapture reads and per-frame analysis from rendering,
+and optionally decodes on the GPU with NVDEC.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def cuda_available() -> bool:
+    """Whether OpenCV was built with CUDA and a CUDA device is present."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:
+        return False
+
+
+def cuda_decode_available() -> bool:
+    """Whether OpenCV was built with cudacodec and a CUDA device is present."""
+    return hasattr(cv2, 'cudacodec') and cuda_available()
+
+
+class GpuVideoReader:
+    """cv2.VideoCapture-compatible wrapper around an NVDEC cv2.cudacodec reader"""
+
+    def __init__(self, source: str):
+        """
+        Open a video file or network stream for GPU decoding.
+
+        Args:
+            source: Video file path or stream URL (cameras are not supported by cudacodec)
+        """
+        self.source = source
+        self._reader = cv2.cudacodec.createVideoReader(source)
+        info = self._reader.format()
+        self._width = int(info.width)
+        self._height = int(info.height)
+        self._fps = float(getattr(info, 'fps', 0.0) or 0.0)
+
+    def isOpened(self) -> bool:
+        return self._reader is not None
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the next frame on the GPU and download it as BGR.
+
+        Args:
+            image: Optional host buffer to download into (reused when the size matches)
+
+        Returns:
+            Tuple of (success, frame) like cv2.VideoCapture.read()
+        """
+        if self._reader is None:
+            return False, None
+
+        ok, gpu_frame = self._reader.nextFrame()
+        if not ok:
+            return False, None
+
+        # Color conversion happens on the GPU; only the final BGR frame crosses the bus
+        if gpu_frame.channels() == 4:
+            gpu_frame = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGRA2BGR)
+
+        width, height = gpu_frame.size()
+        if image is not None and image.shape == (height, width, 3):
+            gpu_frame.download(image)
+            return True, image
+        return True, gpu_frame.download()
+
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self._fps
+        return 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        # Rewinding is done by reopening; other properties are fixed by the stream
+        if prop_id == cv2.CAP_PROP_POS_FRAMES and value == 0:
+            self._reader = cv2.cudacodec.createVideoReader(self.source)
+            return True
+        return False
+
+    def release(self):
+        self._reader = None
+
+
+class FrameGrabber:
+    """Reads frames on a background thread into a small pool of reusable buffers"""
+
+    def __init__(self, cap: cv2.VideoCapture, drop_frames: bool, pool_size: int = 3):
+        """
+        Initialize and start the capture thread.
+
+        Args:
+            cap: Opened video capture object
+            drop_frames: Replace an unconsumed frame with the newest one (live sources).
+                When False the producer waits, so no frames are skipped (video files).
+            pool_size: Number of frame buffers (one being filled, one queued, one in use)
+        """
+        self.cap = cap
+        self.drop_frames = drop_frames
+
+        # Buffers start unallocated; cap.read() sizes them on first use
+        self._free: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        for _ in range(max(3, pool_size)):
+            self._free.put(None)
+        self._latest: "queue.Queue[Tuple[bool, Optional[np.ndarray]]]" = queue.Queue(maxsize=1)
+        self._in_use: Optional[np.ndarray] = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Producer loop: read into a free buffer and publish it"""
+        try:
+            while not self._stop.is_set():
+                buf = self._free.get()
+                ret, frame = self.cap.read(buf)
+                if not ret:
+                    self._publish((False, None))
+                    return
+                self._publish((True, frame))
+        except Exception as e:
+            logger.error(f"Frame capture error: {e}")
+            self._publish((False, None))
+
+    def _publish(self, item: Tuple[bool, Optional[np.ndarray]]):
+        """Hand a frame to the consumer, dropping the stale one for live sources"""
+        while not self._stop.is_set():
+            if self.drop_frames:
+                try:
+                    _, stale = self._latest.get_nowait()
+                    self._free.put(stale)
+                except queue.Empty:
+                    pass
+            try:
+                self._latest.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Get the next frame. The previously returned frame buffer is recycled.
+
+        Args:
+            timeout: Seconds to wait for a frame (None waits indefinitely)
+
+        Returns:
+            Tuple of (success, frame) like cv2.VideoCapture.read()
+        """
+        if self._in_use is not None:
+            self._free.put(self._in_use)
+            self._in_use = None
+
+        try:
+            ret, frame = self._latest.get(timeout=timeout)
+        except queue.Empty:
+            return False, None
+
+        self._in_use = frame
+        return ret, frame
+
+    def stop(self):
+        """Stop the capture thread; the caller still owns and releases the capture"""
+        self._stop.set()
+        # Unblock a producer waiting for a free buffer or queue slot
+        self._free.put(None)
+        try:
+            self._latest.get_nowait()
+        except queue.Empty:
+            pass
+        # Wake a consumer blocked in read() (e.g. a FrameProcessor thread)
+        try:
+            self._latest.put_nowait((False, None))
+        except queue.Full:
+            pass
+        self._thread.join(timeout=2.0)
+
+
+class FrameProcessor:
+    """Runs per-frame analysis (detection and tracking) on a worker thread so it overlaps rendering"""
+
+    def __init__(self, read_frame: Callable[[], Tuple[bool, Optional[np.ndarray]]],
+                 process: Callable[[np.ndarray], Any], pool_size: int = 3):
+        """
+        Initialize and start the processing thread.
+
+        Args:
+            read_frame: Frame source with the cv2.VideoCapture.read() contract (e.g. FrameGrabber.read)
+            process: Analysis run on each frame; its result is delivered with the frame
+            pool_size: Number of frame buffers (one being processed, one queued, one being rendered)
+        """
+        self.read_frame = read_frame
+        self.process = process
+
+        # The source may recycle its buffer on the next read, so frames are copied into our own pool
+        self._free: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        for _ in range(max(3, pool_size)):
+            self._free.put(None)
+        # Bounded hand-off: the worker runs at most one frame ahead of the renderer
+        self._results: "queue.Queue[Tuple[bool, Optional[np.ndarray], Any]]" = queue.Queue(maxsize=1)
+        self._in_use: Optional[np.ndarray] = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="FrameProcessor", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Worker loop: read, copy into a pooled buffer, analyze and publish"""
+        try:
+            while not self._stop.is_set():
+                ret, frame = self.read_frame()
+                if not ret or self._stop.is_set():
+                    self._publish((False, None, None))
+                    return
+
+                buf = self._free.get()
+                if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+                    buf = np.empty_like(frame)
+                np.copyto(buf, frame)
+
+                self._publish((True, buf, self.process(buf)))
+        except Exception as e:
+            logger.error(f"Frame processing error: {e}")
+            self._publish((False, None, None))
+
+    def _publish(self, item: Tuple[bool, Optional[np.ndarray], Any]):
+        """Hand a processed frame to the renderer, waiting while it is busy"""
+        while not self._stop.is_set():
+            try:
+                self._results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray], Any]:
+        """
+        Get the next processed frame. The previously returned frame buffer is recycled.
+
+        Args:
+            timeout: Seconds to wait for a frame (None waits indefinitely)
+
+        Returns:
+            Tuple of (success, frame, analysis result)
+        """
+        if self._in_use is not None:
+            self._free.put(self._in_use)
+            self._in_use = None
+
+        try:
+            ret, frame, result = self._results.get(timeout=timeout)
+        except queue.Empty:
+            return False, None, None
+
+        self._in_use = frame
+        return ret, frame, result
+
+    def stop(self):
+        """Stop the worker thread; stop the frame source first so a blocked read returns"""
+        self._stop.set()
+        try:
+            self._results.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join(timeout=2.0)
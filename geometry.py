@@ -3,17 +3,127 @@ Geometry processing module for coordinate transformations.
 Handles conversions between image and world coordinates.
 """
 
+import threading
 from typing import Optional, Tuple
 
 import cv2
 import numpy as np
-from shapely.geometry import Polygon
 
+from jit_utils import NUMBA_AVAILABLE, njit
 from logger_config import get_logger
 
 logger = get_logger(__name__)
 
 
+@njit(cache=True)
+def _polygon_area(points, n):
+    """Unsigned shoelace area of the first n vertices"""
+    acc = 0.0
+    for i in range(n):
+        j = (i + 1) % n
+        acc += points[i, 0] * points[j, 1] - points[j, 0] * points[i, 1]
+    return abs(acc) * 0.5
+
+
+@njit(cache=True)
+def _clip_half_plane(src, n, dst, axis, bound, keep_greater):
+    """Sutherland-Hodgman step: clip polygon src[:n] against an axis-aligned half-plane into dst"""
+    if n == 0:
+        return 0
+
+    m = 0
+    px = src[n - 1, 0]
+    py = src[n - 1, 1]
+    p_val = src[n - 1, axis]
+    p_in = p_val >= bound if keep_greater else p_val <= bound
+    for i in range(n):
+        cx = src[i, 0]
+        cy = src[i, 1]
+        c_val = src[i, axis]
+        c_in = c_val >= bound if keep_greater else c_val <= bound
+        if c_in != p_in:
+            t = (bound - p_val) / (c_val - p_val)
+            dst[m, 0] = px + t * (cx - px)
+            dst[m, 1] = py + t * (cy - py)
+            m += 1
+        if c_in:
+            dst[m, 0] = cx
+            dst[m, 1] = cy
+            m += 1
+        px = cx
+        py = cy
+        p_val = c_val
+        p_in = c_in
+    return m
+
+
+@njit(cache=True)
+def _rect_intersection_area(quad, x0, y0, x1, y1, buf_a, buf_b):
+    """Area of the intersection between a quad and the rectangle [x0, x1] x [y0, y1]"""
+    for i in range(4):
+        buf_a[i, 0] = quad[i, 0]
+        buf_a[i, 1] = quad[i, 1]
+    n = _clip_half_plane(buf_a, 4, buf_b, 0, x0, True)
+    n = _clip_half_plane(buf_b, n, buf_a, 0, x1, False)
+    n = _clip_half_plane(buf_a, n, buf_b, 1, y0, True)
+    n = _clip_half_plane(buf_b, n, buf_a, 1, y1, False)
+    if n < 3:
+        return 0.0
+    return _polygon_area(buf_a, n)
+
+
+@njit(cache=True)
+def _rasterize_quads(quads, cell_w, cell_h, rows, cols, out):
+    """Accumulate each quad's fractional cell coverage into out (rows x cols)"""
+    buf_a = np.empty((16, 2), dtype=np.float64)
+    buf_b = np.empty((16, 2), dtype=np.float64)
+    for q in range(quads.shape[0]):
+        quad = quads[q]
+        area = _polygon_area(quad, 4)
+        if area <= 1e-6:
+            continue
+
+        minx = min(quad[0, 0], quad[1, 0], quad[2, 0], quad[3, 0])
+        maxx = max(quad[0, 0], quad[1, 0], quad[2, 0], quad[3, 0])
+        miny = min(quad[0, 1], quad[1, 1], quad[2, 1], quad[3, 1])
+        maxy = max(quad[0, 1], quad[1, 1], quad[2, 1], quad[3, 1])
+        min_col = max(0, int(minx // cell_w))
+        max_col = min(cols - 1, int(maxx // cell_w))
+        min_row = max(0, int(miny // cell_h))
+        max_row = min(rows - 1, int(maxy // cell_h))
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                inter = _rect_intersection_area(quad, col * cell_w, row * cell_h,
+                                                (col + 1) * cell_w, (row + 1) * cell_h, buf_a, buf_b)
+                if inter > 0.0:
+                    out[row, col] += min(1.0, inter / area)
+
+
+@njit(cache=True, fastmath=True)
+def _accumulate_rect_overlaps(bounds, cell_w, cell_h, rows, cols, out):
+    """Add each axis-aligned rectangle's (minx, miny, maxx, maxy) cell coverage to out, visiting only covered cells"""
+    for k in range(bounds.shape[0]):
+        minx = bounds[k, 0]
+        miny = bounds[k, 1]
+        maxx = bounds[k, 2]
+        maxy = bounds[k, 3]
+        inv_area = 1.0 / ((maxx - minx) * (maxy - miny))
+
+        min_col = max(0, int(minx // cell_w))
+        max_col = min(cols - 1, int(maxx // cell_w))
+        min_row = max(0, int(miny // cell_h))
+        max_row = min(rows - 1, int(maxy // cell_h))
+        for row in range(min_row, max_row + 1):
+            overlap_y = min(maxy, (row + 1) * cell_h) - max(miny, row * cell_h)
+            if overlap_y <= 0.0:
+                continue
+            for col in range(min_col, max_col + 1):
+                overlap_x = min(maxx, (col + 1) * cell_w) - max(minx, col * cell_w)
+                if overlap_x > 0.0:
+                    out[row, col] += overlap_x * overlap_y * inv_area
+
+
 class GeometryProcessor:
     """Handles geometric transformations and calculations"""
 
@@ -27,27 +137,176 @@ class GeometryProcessor:
         """
         self.H_matrix = homography_matrix
         self.inv_H_matrix = inverse_homography
+        # Per-thread scratch buffers (processors are shared with capture/render threads)
+        self._local = threading.local()
 
-    def project_bbox_to_world(self, bbox: Tuple[int, int, int, int]) -> Tuple[Optional[Polygon], Optional[np.ndarray]]:
+    def _corners_buffer(self, n: int) -> np.ndarray:
         """
-        Project bounding box from image coordinates to world coordinates.
+        Get this thread's reusable float32 corner buffer for n boxes.
         
         Args:
-            bbox: Bounding box as (x1, y1, x2, y2) in image coordinates
+            n: Number of boxes
             
         Returns:
-            Tuple of (Polygon in world coords, corner points in world coords)
+            Array view of shape (n, 4, 2); grown (doubling) when n exceeds the current capacity
+        """
+        buf = getattr(self._local, 'corners', None)
+        if buf is None or len(buf) < n:
+            capacity = max(n, 2 * len(buf) if buf is not None else 16)
+            buf = self._local.corners = np.empty((capacity, 4, 2), dtype=np.float32)
+        return buf[:n]
+
+    def project_bboxes_to_world(self, bboxes: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Project many bounding boxes to world coordinates with a single transform call.
+        
+        Args:
+            bboxes: Array of shape (N, 4) with rows (x1, y1, x2, y2) in image coordinates
+            
+        Returns:
+            Array of shape (N, 4, 2) with the world-space corners of each box
+            (clockwise from top-left), or None on failure
         """
         try:
-            x1, y1, x2, y2 = bbox
-            corners = np.array([[[x1, y1], [x2, y1], [x2, y2], [x1, y2]]], dtype=np.float32)
-            world_points = cv2.perspectiveTransform(corners, self.H_matrix)[0]
+            bboxes = np.asarray(bboxes, dtype=np.float32).reshape(-1, 4)
+            n = len(bboxes)
+            if n == 0:
+                return np.empty((0, 4, 2), dtype=np.float32)
 
-            polygon = Polygon([(float(p[0]), float(p[1])) for p in world_points])
-            return polygon, world_points
+            # perspectiveTransform writes a new array, so the scratch corners can be reused per call
+            corners = self._corners_buffer(n)
+            corners[:, 0, 0] = bboxes[:, 0]
+            corners[:, 0, 1] = bboxes[:, 1]
+            corners[:, 1, 0] = bboxes[:, 2]
+            corners[:, 1, 1] = bboxes[:, 1]
+            corners[:, 2, 0] = bboxes[:, 2]
+            corners[:, 2, 1] = bboxes[:, 3]
+            corners[:, 3, 0] = bboxes[:, 0]
+            corners[:, 3, 1] = bboxes[:, 3]
+
+            world = cv2.perspectiveTransform(corners.reshape(1, 4 * n, 2), self.H_matrix)
+            return world.reshape(n, 4, 2)
+        except Exception as e:
+            logger.warning(f"Failed to project bboxes to world: {e}")
+            return None
+
+    @staticmethod
+    def quad_centroids(quads: np.ndarray) -> np.ndarray:
+        """
+        Compute area centroids of quadrilaterals (shoelace formula).
+        
+        Args:
+            quads: Array of shape (N, 4, 2) with polygon vertices
+            
+        Returns:
+            Array of shape (N, 2) with centroid coordinates; degenerate quads
+            fall back to their vertex mean
+        """
+        quads = np.asarray(quads, dtype=np.float64)
+        x, y = quads[..., 0], quads[..., 1]
+        x_next, y_next = np.roll(x, -1, axis=1), np.roll(y, -1, axis=1)
+        cross = x * y_next - x_next * y
+        area = cross.sum(axis=1) / 2.0
+
+        centroids = quads.mean(axis=1)
+        valid = np.abs(area) > 1e-12
+        if valid.any():
+            factor = 1.0 / (6.0 * area[valid])
+            centroids[valid, 0] = ((x + x_next) * cross).sum(axis=1)[valid] * factor
+            centroids[valid, 1] = ((y + y_next) * cross).sum(axis=1)[valid] * factor
+        return centroids
+
+    @staticmethod
+    def rasterize_quads_to_grid(world_quads: np.ndarray, cell_w: float, cell_h: float,
+                                rows: int, cols: int) -> np.ndarray:
+        """
+        Compute how much of each world-space quad falls into each grid cell.
+        
+        Args:
+            world_quads: Array of shape (N, 4, 2) with quad vertices in world space
+            cell_w: Cell width in meters
+            cell_h: Cell height in meters
+            rows: Number of grid rows
+            cols: Number of grid columns
+            
+        Returns:
+            Array of shape (rows, cols) with the summed per-quad overlap
+            fractions (intersection area / quad area)
+        """
+        coverage = np.zeros((rows, cols), dtype=np.float64)
+        quads = np.ascontiguousarray(world_quads, dtype=np.float64).reshape(-1, 4, 2)
+        if not len(quads):
+            return coverage
+
+        # Axis-aligned rectangles (e.g. scale-only calibrations) have separable
+        # overlap: per-column width times per-row height, done for all cells at once
+        xs, ys = quads[..., 0], quads[..., 1]
+        axis_aligned = (np.isclose(xs[:, 0], xs[:, 3]) & np.isclose(xs[:, 1], xs[:, 2]) &
+                        np.isclose(ys[:, 0], ys[:, 1]) & np.isclose(ys[:, 2], ys[:, 3]))
+        if axis_aligned.any():
+            GeometryProcessor._accumulate_rect_coverage(quads[axis_aligned], cell_w, cell_h, rows, cols, coverage)
+
+        rest = quads[~axis_aligned]
+        if len(rest):
+            _rasterize_quads(np.ascontiguousarray(rest), float(cell_w), float(cell_h), int(rows), int(cols),
+                             coverage)
+        return coverage
+
+    @staticmethod
+    def _accumulate_rect_coverage(rects: np.ndarray, cell_w: float, cell_h: float, rows: int, cols: int,
+                                  coverage: np.ndarray):
+        """
+        Add the coverage fractions of axis-aligned rectangles to a grid.
+        
+        Args:
+            rects: Array of shape (N, 4, 2) with axis-aligned rectangle vertices
+            cell_w: Cell width in meters
+            cell_h: Cell height in meters
+            rows: Number of grid rows
+            cols: Number of grid columns
+            coverage: (rows, cols) array to accumulate into
+        """
+        min_x, max_x = rects[..., 0].min(axis=1), rects[..., 0].max(axis=1)
+        min_y, max_y = rects[..., 1].min(axis=1), rects[..., 1].max(axis=1)
+        area = (max_x - min_x) * (max_y - min_y)
+        valid = area > 1e-6
+        if not valid.any():
+            return
+        min_x, max_x, min_y, max_y, area = min_x[valid], max_x[valid], min_y[valid], max_y[valid], area[valid]
+
+        if NUMBA_AVAILABLE:
+            # Compiled kernel only touches the cells each rectangle spans
+            bounds = np.stack((min_x, min_y, max_x, max_y), axis=1)
+            _accumulate_rect_overlaps(bounds, float(cell_w), float(cell_h), int(rows), int(cols), coverage)
+            return
+
+        col_edges = np.arange(cols + 1) * cell_w
+        row_edges = np.arange(rows + 1) * cell_h
+        overlap_x = np.clip(np.minimum(max_x[:, None], col_edges[None, 1:]) -
+                            np.maximum(min_x[:, None], col_edges[None, :-1]), 0.0, None)
+        overlap_y = np.clip(np.minimum(max_y[:, None], row_edges[None, 1:]) -
+                            np.maximum(min_y[:, None], row_edges[None, :-1]), 0.0, None)
+        coverage += np.einsum('nr,nc->rc', overlap_y, overlap_x / area[:, None])
+
+    def world_to_image_points(self, world_points: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Convert many world points to image coordinates with a single transform call.
+        
+        Args:
+            world_points: Array of shape (N, 2) in world space (meters)
+            
+        Returns:
+            Array of shape (N, 2) int32 in image coordinates (pixels), or None on failure
+        """
+        try:
+            points = np.asarray(world_points, dtype=np.float32).reshape(1, -1, 2)
+            if points.shape[1] == 0:
+                return np.empty((0, 2), dtype=np.int32)
+            image_points = cv2.perspectiveTransform(points, self.inv_H_matrix)[0]
+            return image_points.astype(np.int32)
         except Exception as e:
-            logger.warning(f"Failed to project bbox to world: {e}")
-            return None, None
+            logger.warning(f"Failed to convert world to image points: {e}")
+            return None
 
     def world_to_image_point(self, world_x: float, world_y: float) -> Tuple[int, int]:
         """
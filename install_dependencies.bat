@@ -21,7 +21,7 @@ echo Step 2: Installing project requirements...
 echo.
 
 echo Step 3: Verifying installation...
-"%PYTHON_EXE%" -c "import cv2; import numpy; import ultralytics; import shapely; print('All imports successful!'); print(f'OpenCV: {cv2.__version__}'); print(f'NumPy: {numpy.__version__}')"
+"%PYTHON_EXE%" -c "import cv2; import numpy; import ultralytics; print('All imports successful!'); print(f'OpenCV: {cv2.__version__}'); print(f'NumPy: {numpy.__version__}')"
 echo.
 
 echo Installation complete!
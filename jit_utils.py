@@ -0,0 +1,22 @@
+"""
+Optional Numba JIT support for numeric hot paths.
+Falls back to NumPy implementations when Numba is not installed.
+"""
+
+from logger_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.info("Numba not available, using NumPy kernels (install with: pip install numba)")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
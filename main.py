@@ -8,6 +8,7 @@ import os
 import sys
 from dataclasses import fields
 from pathlib import Path
+from typing import List, Optional
 
 APP_DIR = Path(__file__).resolve().parent
 if Path.cwd() != APP_DIR:
@@ -20,22 +21,29 @@ AUTH_DIR = APP_DIR / "auth"
 if str(AUTH_DIR) not in sys.path:
     sys.path.insert(0, str(AUTH_DIR))
 
-import cv2
+# Keep BLAS/OpenMP pools single-threaded so they do not oversubscribe cores in the
+# per-frame loop. Must be set before numpy/cv2/torch are imported; the detector sets
+# its own inference thread count explicitly.
+for _thread_var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                    "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"):
+    os.environ.setdefault(_thread_var, "1")
 
 from auth.license_manager import LicenseManager
 from config import DEFAULT_WEBSOCKET_DEVICE_ID, DEFAULT_WEBSOCKET_DEVICE_NAME, MonitoringConfig
 from logger_config import get_logger
-from monitor import CrowdMonitor
+
+# OpenCV and the monitor (YOLO/torch) are imported in main() once arguments parse,
+# so --help and argument errors do not load them
 
 logger = get_logger(__name__)
 
 
-def parse_arguments() -> MonitoringConfig:
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Parse command line arguments and create configuration.
+    Build the full command line parser.
     
     Returns:
-        Monitoring configuration object
+        Argument parser with every monitoring option
     """
     parser = argparse.ArgumentParser(
         description="Enhanced Crowd Monitoring System with Interactive Features",
@@ -123,20 +131,56 @@ def parse_arguments() -> MonitoringConfig:
     parser.add_argument("--websocket-debounce", type=float, default=3.0,
                         help="Seconds between debounced WebSocket payload sends/logs")
 
-    args = parser.parse_args()
+    return parser
 
-    if args.config_file:
-        with open(args.config_file, 'r') as f:
-            config_dict = json.load(f)
 
-        valid_fields = {field.name for field in fields(MonitoringConfig)}
-        unknown_fields = sorted(set(config_dict) - valid_fields)
-        if unknown_fields:
-            logger.warning(f"Ignoring unknown config field(s): {', '.join(unknown_fields)}")
+def _load_config_file(path: str) -> MonitoringConfig:
+    """
+    Create configuration from a JSON file of MonitoringConfig values.
+    
+    Args:
+        path: JSON file path
+        
+    Returns:
+        Monitoring configuration object
+    """
+    with open(path, 'r') as f:
+        config_dict = json.load(f)
+
+    valid_fields = {field.name for field in fields(MonitoringConfig)}
+    unknown_fields = sorted(set(config_dict) - valid_fields)
+    if unknown_fields:
+        logger.warning(f"Ignoring unknown config field(s): {', '.join(unknown_fields)}")
+
+    return MonitoringConfig(**{
+        key: value for key, value in config_dict.items() if key in valid_fields
+    })
 
-        return MonitoringConfig(**{
-            key: value for key, value in config_dict.items() if key in valid_fields
-        })
+
+def parse_arguments(argv: Optional[List[str]] = None) -> MonitoringConfig:
+    """
+    Parse command line arguments and create configuration.
+    
+    Args:
+        argv: Arguments to parse (defaults to sys.argv[1:])
+        
+    Returns:
+        Monitoring configuration object
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # The GUIs launch with only --config-file; that path does not need the full parser
+    pre_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    pre_parser.add_argument("--config-file", type=str)
+    pre_args, remaining = pre_parser.parse_known_args(argv)
+    if pre_args.config_file and not remaining:
+        return _load_config_file(pre_args.config_file)
+
+    args = _build_parser().parse_args(argv)
+
+    if args.config_file:
+        return _load_config_file(args.config_file)
 
     # Create configuration object
     config = MonitoringConfig(
@@ -203,6 +247,8 @@ def main():
                     f"Grid adjustment={config.enable_grid_adjustment}")
 
         # Initialize and run monitoring system
+        from monitor import CrowdMonitor
+
         monitor = CrowdMonitor(config)
         success = monitor.initialize()
 
@@ -219,11 +265,13 @@ def main():
         logger.error(f"System error: {e}")
         return 1
     finally:
-        # Cleanup
-        try:
-            cv2.destroyAllWindows()
-        except Exception:
-            pass
+        # Cleanup (only if OpenCV was loaded; importing it here would be wasted work)
+        cv2 = sys.modules.get("cv2")
+        if cv2 is not None:
+            try:
+                cv2.destroyAllWindows()
+            except Exception:
+                pass
 
     return 0
 
@@ -3,8 +3,10 @@ Main crowd monitoring system.
 Orchestrates all components for real-time monitoring.
 """
 
+import itertools
 import platform
 import time
+from collections import deque
 from typing import List, Optional, Tuple, Union
 
 import cv2
@@ -13,6 +15,7 @@ import numpy as np
 from calibration import CameraCalibrator
 from config import DEFAULT_WEBSOCKET_DEVICE_ID, MonitoringConfig, TrackData
 from detector import PersonDetector
+from frame_grabber import FrameGrabber, FrameProcessor, GpuVideoReader, cuda_available, cuda_decode_available
 from logger_config import get_logger
 from occupancy import OccupancyGrid
 from trackers import DeepSortTracker, SimpleCentroidTracker
@@ -23,6 +26,12 @@ from window_utils import create_visible_window, normalize_key, set_window_title,
 logger = get_logger(__name__)
 IS_MACOS = platform.system() == "Darwin"
 
+# URL schemes of network streams treated as live sources
+LIVE_STREAM_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+# Display modes that show occupancy and therefore need the grid updated
+OCCUPANCY_MODES = frozenset({'4', '5'})
+
 
 def open_video_capture(source) -> cv2.VideoCapture:
     """Open camera sources with the native macOS backend when available."""
@@ -133,7 +142,7 @@ class CrowdMonitor:
         # Runtime state
         self.frame_count = 0
         self.last_detection_frame = -1
-        self.fps_counter = []
+        self.fps_counter = deque(maxlen=config.fps_counter_window)
         self.fps_start_time = time.time()
 
         # Interactive display modes
@@ -146,10 +155,34 @@ class CrowdMonitor:
         }
         self.current_mode = '4'  # Start with monitoring view
 
+        # View builders per display mode, all called as (frame, tracks, show_fps)
+        self._vis_dispatch = {
+            '1': self._vis_raw,
+            '2': self._vis_grid,
+            '3': self._create_detection_view,
+            '4': self._create_monitoring_view,
+            '5': self._create_split_view,
+        }
+
         # Camera dimensions
         self.camera_width = 0
         self.camera_height = 0
 
+        # Reusable frame buffers (allocated once the camera size is known)
+        self._frame_buf: Optional[np.ndarray] = None
+        self._display_buf: Optional[np.ndarray] = None
+        # Scratch buffers views are drawn into instead of per-frame frame.copy()
+        self._scratch_full: Optional[np.ndarray] = None
+        self._monitor_out: Optional[np.ndarray] = None
+        self._split_out: Optional[np.ndarray] = None
+
+        # Device buffers for GPU display scaling, reused across frames
+        self._use_gpu_render = config.gpu_render and cuda_available()
+        if config.gpu_render and not self._use_gpu_render:
+            logger.warning("GPU rendering requested but OpenCV CUDA is not available, using CPU")
+        self._gpu_display_src = cv2.cuda_GpuMat() if self._use_gpu_render else None
+        self._gpu_display_dst = cv2.cuda_GpuMat() if self._use_gpu_render else None
+
         # Grid settings
         self.original_cell_width = config.cell_width
         self.original_cell_height = config.cell_height
@@ -214,6 +247,7 @@ class CrowdMonitor:
             self.camera_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             self.camera_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             logger.info(f"Camera resolution: {self.camera_width}x{self.camera_height}")
+            self._frame_buf = np.empty((self.camera_height, self.camera_width, 3), dtype=np.uint8)
 
             # Perform calibration after the camera has produced a usable frame.
             frame = self._read_calibration_frame(cap)
@@ -273,6 +307,14 @@ class CrowdMonitor:
             logger.error(f"Initialization failed: {e}")
             return False
 
+    def _is_live_source(self) -> bool:
+        """Whether the configured source is a camera or network stream (as opposed to a file)."""
+        source = self.config.source
+        if isinstance(source, int):
+            return True
+        source = str(source)
+        return source.isdigit() or source.lower().startswith(LIVE_STREAM_PREFIXES)
+
     def _read_calibration_frame(self, cap: cv2.VideoCapture) -> Optional[np.ndarray]:
         """Read a non-black frame for calibration, allowing webcams to warm up."""
         source = self.config.source
@@ -347,6 +389,30 @@ class CrowdMonitor:
 
         return available_cameras
 
+    def _open_gpu_reader(self, source) -> Optional[GpuVideoReader]:
+        """
+        Open an NVDEC reader for file/stream sources when GPU decoding is enabled.
+        
+        Args:
+            source: Video source (camera index, file path or URL)
+            
+        Returns:
+            GPU reader, or None to fall back to cv2.VideoCapture
+        """
+        if not self.config.gpu_decode or isinstance(source, int):
+            return None
+        if not cuda_decode_available():
+            logger.warning("GPU decoding requested but OpenCV cudacodec/CUDA is not available")
+            return None
+
+        try:
+            reader = GpuVideoReader(source)
+            logger.info("Decoding video on the GPU (cudacodec)")
+            return reader
+        except Exception as e:
+            logger.warning(f"GPU decoding unavailable for {source}: {e}")
+            return None
+
     def _initialize_video_capture(self) -> Optional[cv2.VideoCapture]:
         """
         Initialize video capture with the configured source.
@@ -364,7 +430,7 @@ class CrowdMonitor:
                 # Otherwise it's a file path, keep as string
 
             logger.info(f"Initializing video source: {source}")
-            cap = open_video_capture(source)
+            cap = self._open_gpu_reader(source) or open_video_capture(source)
 
             if cap.isOpened():
                 # For camera sources, set properties
@@ -453,6 +519,20 @@ class CrowdMonitor:
         show_fps = False
         window_created = False
 
+        # Capture on a background thread so decoding overlaps detection and rendering.
+        # Live sources drop stale frames; files are read without skipping.
+        grabber = None
+        if self.config.threaded_capture:
+            grabber = FrameGrabber(cap, drop_frames=self._is_live_source())
+
+        # Detection and tracking run one frame ahead on a worker thread, overlapping
+        # rendering; the worker numbers frames itself for the detect_every schedule
+        processor = None
+        if self.config.pipelined_processing:
+            processed_frames = itertools.count(1)
+            processor = FrameProcessor(grabber.read if grabber is not None else cap.read,
+                                       lambda f: self._process_frame(f, next(processed_frames)))
+
         try:
             while True:
                 # Check if stop was requested (from GUI)
@@ -460,26 +540,34 @@ class CrowdMonitor:
                     logger.info("Stop requested by GUI")
                     break
                 
-                ret, frame = cap.read()
+                tracks = None
+                if processor is not None:
+                    ret, frame, tracks = processor.read()
+                elif grabber is not None:
+                    ret, frame = grabber.read()
+                else:
+                    # Decode into the reusable buffer; OpenCV returns a new array if the size differs
+                    ret, frame = cap.read(self._frame_buf)
                 if not ret:
                     logger.warning("Failed to read frame, ending processing")
                     break
+                if grabber is None and processor is None:
+                    self._frame_buf = frame
 
                 self.frame_count += 1
                 current_time = time.time()
                 dt = current_time - last_time
                 last_time = current_time
 
-                # Update FPS tracking
+                # Update FPS tracking (deque evicts the oldest timestamp itself)
                 self.fps_counter.append(current_time)
-                if len(self.fps_counter) > self.config.fps_counter_window:
-                    self.fps_counter.pop(0)
 
-                # Process frame
-                tracks = self._process_frame(frame)
+                # Process frame (already done by the worker when pipelined)
+                if processor is None:
+                    tracks = self._process_frame(frame)
 
-                # Update occupancy grid (only for monitoring modes)
-                if self.current_mode in ['4', '5']:
+                # Update occupancy grid (only for monitoring modes; skips all projection work otherwise)
+                if self.current_mode in OCCUPANCY_MODES:
                     self.occupancy_grid.update(tracks, dt)
 
                 # Schedule WebSocket payload for interval debounce
@@ -494,28 +582,35 @@ class CrowdMonitor:
                     )
                     self.ws_sender.schedule(payload)
 
-                # Generate visualization
-                display_frame = self._create_visualization(frame, tracks, show_fps)
+                # Render only frames that will be shown; headless runs skip rendering entirely
+                display_frame = None
+                render = self.config.show_window and self.frame_count % max(1, self.config.render_every) == 0
+                if render:
+                    # Generate visualization
+                    display_frame = self._create_visualization(frame, tracks, show_fps)
+
+                    # Resize display frame if it's too large for the screen
+                    display_frame = self._resize_for_display(display_frame)
+
+                    # Display the frame
+                    window_title = f"Enhanced Crowd Monitor - {self.display_modes[self.current_mode]}"
+                    if not window_created:
+                        create_visible_window(self.window_name, display_frame.shape[1], display_frame.shape[0])
+                        window_created = True
+                    else:
+                        try:
+                            cv2.resizeWindow(self.window_name, display_frame.shape[1], display_frame.shape[0])
+                        except cv2.error:
+                            pass
 
-                # Resize display frame if it's too large for the screen
-                display_frame = self._resize_for_display(display_frame)
+                    set_window_title(self.window_name, window_title)
+                    cv2.imshow(self.window_name, display_frame)
 
-                # Display the frame
-                window_title = f"Enhanced Crowd Monitor - {self.display_modes[self.current_mode]}"
-                if not window_created:
-                    create_visible_window(self.window_name, display_frame.shape[1], display_frame.shape[0])
-                    window_created = True
-                else:
-                    try:
-                        cv2.resizeWindow(self.window_name, display_frame.shape[1], display_frame.shape[0])
-                    except cv2.error:
-                        pass
-
-                set_window_title(self.window_name, window_title)
-                cv2.imshow(self.window_name, display_frame)
+                if not self.config.show_window:
+                    continue
 
                 # Handle user input
-                key = normalize_key(wait_key(30))
+                key = normalize_key(wait_key(30 if render else 1))
                 if key != -1:
                     logger.info(f"OpenCV key received: {chr(key) if 32 <= key <= 126 else key}")
 
@@ -525,6 +620,9 @@ class CrowdMonitor:
                 elif key in [ord('1'), ord('2'), ord('3'), ord('4'), ord('5')]:
                     self._handle_mode_switch(chr(key))
                 elif key == ord('s') and self.config.enable_screenshots:
+                    if display_frame is None:
+                        display_frame = self._resize_for_display(
+                            self._create_visualization(frame, tracks, show_fps))
                     self._save_screenshot(display_frame)
                 elif key == ord('g') and self.config.enable_grid_adjustment:
                     self._toggle_grid_size()
@@ -538,21 +636,30 @@ class CrowdMonitor:
             logger.info("Processing interrupted by user")
         except Exception as e:
             logger.error(f"Error in video processing loop: {e}")
+        finally:
+            if grabber is not None:
+                grabber.stop()
+            if processor is not None:
+                processor.stop()
 
-    def _process_frame(self, frame: np.ndarray) -> List[TrackData]:
+    def _process_frame(self, frame: np.ndarray, frame_index: Optional[int] = None) -> List[TrackData]:
         """
         Process a single frame for detections and tracking.
         
         Args:
             frame: Input frame
+            frame_index: 1-based frame number (defaults to frame_count)
             
         Returns:
             List of current tracks
         """
+        if frame_index is None:
+            frame_index = self.frame_count
+
         detections = []
-        if self.frame_count % self.config.detect_every == 0:
+        if frame_index % self.config.detect_every == 0:
             detections = self.detector.detect_persons(frame)
-            self.last_detection_frame = self.frame_count
+            self.last_detection_frame = frame_index
 
         if self.tracker is not None:
             tracks = self.tracker.update_tracks(detections, frame)
@@ -572,62 +679,105 @@ class CrowdMonitor:
         Returns:
             Visualization frame
         """
-        if self.current_mode == '1':  # Raw Camera
-            return self._create_raw_camera_view(frame, show_fps)
-        elif self.current_mode == '2':  # Grid Overlay
-            return self._create_grid_overlay_view(frame, show_fps)
-        elif self.current_mode == '3':  # Detection View
-            return self._create_detection_view(frame, tracks, show_fps)
-        elif self.current_mode == '4':  # Monitoring View
-            return self._create_monitoring_view(frame, tracks, show_fps)
-        elif self.current_mode == '5':  # Split View
-            return self._create_split_view(frame, tracks, show_fps)
-        else:
+        view_builder = self._vis_dispatch.get(self.current_mode)
+        if view_builder is None:
             return frame
+        return view_builder(frame, tracks, show_fps)
+
+    def _vis_raw(self, frame: np.ndarray, tracks: List[TrackData], show_fps: bool) -> np.ndarray:
+        """Dispatch adapter for the raw camera view (tracks unused)"""
+        return self._create_raw_camera_view(frame, show_fps)
+
+    def _vis_grid(self, frame: np.ndarray, tracks: List[TrackData], show_fps: bool) -> np.ndarray:
+        """Dispatch adapter for the grid overlay view (tracks unused)"""
+        return self._create_grid_overlay_view(frame, show_fps)
+
+    def _scratch_copy(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Copy a frame into the reusable full-size scratch buffer.
+        
+        The result is only valid until the next call, so callers must finish with
+        (or downscale) one view before building another.
+        
+        Args:
+            frame: Input frame
+            
+        Returns:
+            Scratch buffer holding a copy of the frame
+        """
+        if self._scratch_full is None or self._scratch_full.shape != frame.shape:
+            self._scratch_full = np.empty_like(frame)
+        np.copyto(self._scratch_full, frame)
+        return self._scratch_full
+
+    @staticmethod
+    def _composite_buffer(buffer: Optional[np.ndarray], height: int, width: int) -> np.ndarray:
+        """Reuse a composite output buffer, reallocating only when its size changes"""
+        if buffer is None or buffer.shape != (height, width, 3):
+            buffer = np.empty((height, width, 3), dtype=np.uint8)
+        return buffer
 
     def _create_raw_camera_view(self, frame: np.ndarray, show_fps: bool) -> np.ndarray:
         """Create raw camera view"""
-        view = frame.copy()
-        self.visualizer.add_basic_info_overlay(view, "Raw Camera", self.fps_counter,
-                                               self.fps_start_time, show_fps)
+        view = self._scratch_copy(frame)
+        self._annotate_raw_view(view, show_fps)
         return view
 
+    def _annotate_raw_view(self, view: np.ndarray, show_fps: bool, scale: float = 1.0):
+        """Draw the raw camera view overlays onto a (possibly downscaled) frame"""
+        self.visualizer.add_basic_info_overlay(view, "Raw Camera", self.fps_counter,
+                                               self.fps_start_time, show_fps, scale=scale)
+
     def _create_grid_overlay_view(self, frame: np.ndarray, show_fps: bool) -> np.ndarray:
         """Create camera view with grid overlay"""
-        view = frame.copy()
-        self.visualizer.draw_grid_overlay(view, self.calibrator.geometry_processor, self.occupancy_grid)
-        self.visualizer.add_basic_info_overlay(view, "Grid Overlay", self.fps_counter,
-                                               self.fps_start_time, show_fps)
+        view = self._scratch_copy(frame)
+        self._annotate_grid_view(view, show_fps)
         return view
 
+    def _annotate_grid_view(self, view: np.ndarray, show_fps: bool, scale: float = 1.0):
+        """Draw the grid overlay view overlays onto a (possibly downscaled) frame"""
+        self.visualizer.draw_grid_overlay(view, self.calibrator.geometry_processor, self.occupancy_grid,
+                                          scale=scale)
+        self.visualizer.add_basic_info_overlay(view, "Grid Overlay", self.fps_counter,
+                                               self.fps_start_time, show_fps, scale=scale)
+
     def _create_detection_view(self, frame: np.ndarray, tracks: List[TrackData],
                                show_fps: bool) -> np.ndarray:
         """Create detection view with bounding boxes"""
-        view = frame.copy()
+        view = self._scratch_copy(frame)
+        self._annotate_detection_view(view, tracks, show_fps)
+        return view
+
+    def _annotate_detection_view(self, view: np.ndarray, tracks: List[TrackData], show_fps: bool,
+                                 scale: float = 1.0):
+        """Draw the detection view overlays onto a (possibly downscaled) frame"""
         for track in tracks:
-            self.visualizer.draw_simple_track_annotation(view, track)
+            self.visualizer.draw_simple_track_annotation(view, track, scale=scale)
         info_text = f"People detected: {len(tracks)}"
-        cv2.putText(view, info_text, (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        cv2.putText(view, info_text, (round(10 * scale), round(60 * scale)), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7 * scale, (0, 255, 0), max(1, round(2 * scale)))
         self.visualizer.add_basic_info_overlay(view, "Detection View", self.fps_counter,
-                                               self.fps_start_time, show_fps)
-        return view
+                                               self.fps_start_time, show_fps, scale=scale)
 
     def _create_monitoring_view(self, frame: np.ndarray, tracks: List[TrackData],
                                 show_fps: bool) -> np.ndarray:
         """Create full monitoring view with all features"""
-        view = frame.copy()
+        # Draw the view and the info panel straight into one composite buffer
+        height, width = frame.shape[:2]
+        self._monitor_out = self._composite_buffer(self._monitor_out,
+                                                   height + self.config.info_panel_height, width)
+        view = self._monitor_out[:height]
+        np.copyto(view, frame)
         self.visualizer.draw_grid_overlay(view, self.calibrator.geometry_processor, self.occupancy_grid)
-        for track in tracks:
-            self.visualizer.draw_track_annotation(view, track, self.occupancy_grid)
+        self.visualizer.draw_track_annotations(view, tracks, self.occupancy_grid)
         self.visualizer.draw_cell_occupancy_overlay(view, self.calibrator.geometry_processor,
                                                     self.occupancy_grid)
-        info_panel = self.visualizer.create_info_panel(
-            view.shape[1], tracks, self.occupancy_grid, self.frame_count,
+        self.visualizer.create_info_panel(
+            width, tracks, self.occupancy_grid, self.frame_count,
             self.display_modes[self.current_mode], self.tracker, self.fps_counter,
-            self.fps_start_time, show_fps
+            self.fps_start_time, show_fps, out=self._monitor_out[height:]
         )
-        view = np.vstack([view, info_panel])
-        return view
+        return self._monitor_out
 
     def _create_split_view(self, frame: np.ndarray, tracks: List[TrackData],
                            show_fps: bool) -> np.ndarray:
@@ -635,24 +785,32 @@ class CrowdMonitor:
         small_height = self.camera_height // self.config.split_view_divisor
         small_width = self.camera_width // self.config.split_view_divisor
 
-        raw_small = cv2.resize(self._create_raw_camera_view(frame, False), (small_width, small_height))
-        grid_small = cv2.resize(self._create_grid_overlay_view(frame, False), (small_width, small_height))
-        detection_small = cv2.resize(self._create_detection_view(frame, tracks, False),
-                                     (small_width, small_height))
+        # Downscale the frame once and draw each camera tile's overlays at tile resolution
+        self._split_out = self._composite_buffer(self._split_out, small_height * 2, small_width * 2)
+        raw_small = self._split_out[:small_height, :small_width]
+        grid_small = self._split_out[:small_height, small_width:]
+        detection_small = self._split_out[small_height:, :small_width]
+        birdseye_small = self._split_out[small_height:, small_width:]
+
+        small_size = (small_width, small_height)
+        cv2.resize(frame, small_size, dst=raw_small)
+        np.copyto(grid_small, raw_small)
+        np.copyto(detection_small, raw_small)
+
+        scale = small_width / frame.shape[1]
+        self._annotate_raw_view(raw_small, False, scale)
+        self._annotate_grid_view(grid_small, False, scale)
+        self._annotate_detection_view(detection_small, tracks, False, scale)
         birdseye_view = self.visualizer.create_birdseye_view(tracks, self.calibrator.geometry_processor,
                                                              self.occupancy_grid)
-        birdseye_small = cv2.resize(birdseye_view, (small_width, small_height))
+        cv2.resize(birdseye_view, small_size, dst=birdseye_small)
 
         cv2.putText(raw_small, "RAW CAMERA", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         cv2.putText(grid_small, "WITH GRID", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
         cv2.putText(detection_small, "DETECTION", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
         cv2.putText(birdseye_small, "BIRD'S EYE", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
 
-        top_row = np.hstack([raw_small, grid_small])
-        bottom_row = np.hstack([detection_small, birdseye_small])
-        split_frame = np.vstack([top_row, bottom_row])
-
-        return split_frame
+        return self._split_out
 
     def _resize_for_display(self, frame: np.ndarray) -> np.ndarray:
         """
@@ -681,8 +839,17 @@ class CrowdMonitor:
         new_width = int(width * scale)
         new_height = int(height * scale)
 
-        # Resize frame
-        resized = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
+        # Resize frame into the reusable display buffer
+        if self._display_buf is None or self._display_buf.shape != (new_height, new_width, 3):
+            self._display_buf = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        if self._use_gpu_render:
+            self._gpu_display_src.upload(frame)
+            cv2.cuda.resize(self._gpu_display_src, (new_width, new_height), self._gpu_display_dst,
+                            interpolation=cv2.INTER_AREA)
+            resized = self._gpu_display_dst.download(self._display_buf)
+        else:
+            resized = cv2.resize(frame, (new_width, new_height), dst=self._display_buf,
+                                 interpolation=cv2.INTER_AREA)
         logger.debug(f"Resized display from {width}x{height} to {new_width}x{new_height}")
 
         return resized
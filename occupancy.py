@@ -15,7 +15,6 @@ import wave
 from typing import List, Optional
 
 import numpy as np
-from shapely.geometry import box as shapely_box
 
 from config import MonitoringConfig, TrackData
 from geometry import GeometryProcessor
@@ -23,6 +22,30 @@ from logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Storage type for per-cell grid state (EMA counts and alert timers)
+GRID_DTYPE = np.float32
+
+
+def _cells_to_cover(extent: float, cell_size: float) -> int:
+    """
+    Number of cells needed to cover an extent.
+    
+    Dimensions given in whole millimetres are divided exactly in integers, so
+    e.g. 1.1 m / 0.1 m yields 11 rather than ceil(11.000000000000002) = 12.
+    
+    Args:
+        extent: World extent in meters
+        cell_size: Cell size in meters
+        
+    Returns:
+        Number of cells (ceiling of extent / cell_size)
+    """
+    extent_mm = round(extent * 1000)
+    cell_mm = round(cell_size * 1000)
+    if cell_mm > 0 and abs(extent * 1000 - extent_mm) < 1e-6 and abs(cell_size * 1000 - cell_mm) < 1e-6:
+        return int(-(-extent_mm // cell_mm))
+    return int(math.ceil(extent / cell_size))
+
 
 class OccupancyGrid:
     """Manages occupancy grid for crowd density monitoring"""
@@ -44,8 +67,8 @@ class OccupancyGrid:
         self.world_height = world_height
 
         # Calculate grid dimensions
-        self.grid_cols = int(math.ceil(world_width / config.cell_width))
-        self.grid_rows = int(math.ceil(world_height / config.cell_height))
+        self.grid_cols = _cells_to_cover(world_width, config.cell_width)
+        self.grid_rows = _cells_to_cover(world_height, config.cell_height)
 
         # Calculate cell capacity based on person radius
         person_area = math.pi * config.person_radius ** 2
@@ -53,14 +76,55 @@ class OccupancyGrid:
         self.cell_capacity = max(1, int(cell_area / person_area))
 
         # Initialize runtime state arrays
-        self.ema_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=np.float32)
-        self.timers = np.zeros((self.grid_rows, self.grid_cols), dtype=np.float32)
+        self.ema_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
+        self.timers = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
         self.notified = np.zeros((self.grid_rows, self.grid_cols), dtype=bool)
+        self._current_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
         self._audio_alert_running = False
 
+        # Image-space cell geometry (only changes with calibration or cell size)
+        self.cell_pixel_centers = np.zeros((self.grid_rows, self.grid_cols, 2), dtype=np.int32)
+        self.cell_pixel_corners = np.zeros((self.grid_rows, self.grid_cols, 4, 2), dtype=np.int32)
+        self.grid_line_endpoints = np.empty((0, 4), dtype=np.int32)
+        self._cache_cell_geometry()
+
         logger.info(f"Grid initialized: {self.grid_rows}x{self.grid_cols} cells, "
                     f"capacity: {self.cell_capacity} per cell")
 
+    def _cache_cell_geometry(self):
+        """Project cell centers, corners and grid lines to image pixels once for the current grid."""
+        rows, cols = self.grid_rows, self.grid_cols
+        cell_w, cell_h = self.config.cell_width, self.config.cell_height
+
+        # Cell centers, row-major
+        cx, cy = np.meshgrid((np.arange(cols) + 0.5) * cell_w, (np.arange(rows) + 0.5) * cell_h)
+        centers = self.geometry_processor.world_to_image_points(np.stack([cx.ravel(), cy.ravel()], axis=1))
+
+        # Shared grid vertices, gathered into TL, TR, BR, BL corners per cell
+        vx, vy = np.meshgrid(np.arange(cols + 1) * cell_w, np.arange(rows + 1) * cell_h)
+        vertices = self.geometry_processor.world_to_image_points(np.stack([vx.ravel(), vy.ravel()], axis=1))
+
+        # Grid lines span the monitored area: row lines then column lines as (x1, y1, x2, y2)
+        row_y = np.arange(rows + 1) * cell_h
+        col_x = np.arange(cols + 1) * cell_w
+        line_ends = np.concatenate([
+            np.stack([np.zeros_like(row_y), row_y, np.full_like(row_y, self.world_width), row_y], axis=1),
+            np.stack([col_x, np.zeros_like(col_x), col_x, np.full_like(col_x, self.world_height)], axis=1),
+        ]).reshape(-1, 2)
+        line_ends = self.geometry_processor.world_to_image_points(line_ends)
+        self.grid_line_endpoints = (line_ends.reshape(-1, 4) if line_ends is not None
+                                    else np.empty((0, 4), dtype=np.int32))
+
+        if centers is None or vertices is None:
+            self.cell_pixel_centers = np.zeros((rows, cols, 2), dtype=np.int32)
+            self.cell_pixel_corners = np.zeros((rows, cols, 4, 2), dtype=np.int32)
+            return
+
+        self.cell_pixel_centers = centers.reshape(rows, cols, 2)
+        vertices = vertices.reshape(rows + 1, cols + 1, 2)
+        self.cell_pixel_corners = np.stack([vertices[:-1, :-1], vertices[:-1, 1:],
+                                            vertices[1:, 1:], vertices[1:, :-1]], axis=2)
+
     def update(self, tracks: List[TrackData], dt: float):
         """
         Update the occupancy grid with current tracks.
@@ -69,39 +133,24 @@ class OccupancyGrid:
             tracks: List of current tracks
             dt: Time delta since last update
         """
-        current_counts = np.zeros_like(self.ema_counts)
-
-        for track in tracks:
-            polygon, _ = self.geometry_processor.project_bbox_to_world(track.bbox)
-            if polygon is None or polygon.area <= 1e-6:
-                continue
-
-            minx, miny, maxx, maxy = polygon.bounds
-            min_col = max(0, int(minx // self.config.cell_width))
-            max_col = min(self.grid_cols - 1, int(maxx // self.config.cell_width))
-            min_row = max(0, int(miny // self.config.cell_height))
-            max_row = min(self.grid_rows - 1, int(maxy // self.config.cell_height))
-
-            for row in range(min_row, max_row + 1):
-                for col in range(min_col, max_col + 1):
-                    cell_polygon = shapely_box(
-                        col * self.config.cell_width,
-                        row * self.config.cell_height,
-                        (col + 1) * self.config.cell_width,
-                        (row + 1) * self.config.cell_height
-                    )
+        current_counts = self._current_counts
+        current_counts.fill(0)
 
-                    try:
-                        intersection = polygon.intersection(cell_polygon)
-                        if not intersection.is_empty:
-                            overlap_fraction = intersection.area / polygon.area
-                            current_counts[row, col] += max(0.0, min(1.0, overlap_fraction))
-                    except Exception:
-                        current_counts[row, col] += 0.1
+        world_quads = None
+        if tracks:
+            world_quads = self.geometry_processor.project_bboxes_to_world(
+                np.array([track.bbox for track in tracks], dtype=np.float32))
+
+        if world_quads is not None and len(world_quads):
+            current_counts += self.geometry_processor.rasterize_quads_to_grid(
+                world_quads, self.config.cell_width, self.config.cell_height,
+                self.grid_rows, self.grid_cols)
 
-        # Apply exponential moving average
-        self.ema_counts = (self.config.ema_alpha * current_counts +
-                           (1.0 - self.config.ema_alpha) * self.ema_counts)
+        # Apply exponential moving average in place, keeping the arithmetic in GRID_DTYPE
+        alpha = GRID_DTYPE(self.config.ema_alpha)
+        self.ema_counts *= GRID_DTYPE(1.0) - alpha
+        current_counts *= alpha
+        self.ema_counts += current_counts
 
         # Update alerts
         self._update_alerts(dt)
@@ -113,33 +162,30 @@ class OccupancyGrid:
         Args:
             dt: Time delta since last update
         """
-        should_play_audio_alert = False
-        for row in range(self.grid_rows):
-            for col in range(self.grid_cols):
-                if self.ema_counts[row, col] > self.cell_capacity:
-                    self.timers[row, col] += dt
-                else:
-                    self.timers[row, col] = max(0.0, self.timers[row, col] - dt)
-
-                if (self.timers[row, col] >= self.config.hysteresis_time and
-                        not self.notified[row, col]):
-                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                    logger.warning(
-                        f"OVERCAPACITY ALERT - Cell ({row},{col}) "
-                        f"occupancy: {self.ema_counts[row, col]:.2f}/{self.cell_capacity} "
-                        f"at {timestamp}"
-                    )
-                    self.notified[row, col] = True
-                    should_play_audio_alert = True
-
-                if (self.notified[row, col] and
-                        self.ema_counts[row, col] <= max(0, self.cell_capacity - self.config.alert_clear_offset)):
-                    logger.info(f"Alert cleared for cell ({row},{col})")
-                    self.notified[row, col] = False
-
-        if should_play_audio_alert:
+        over_capacity = self.ema_counts > self.cell_capacity
+        np.subtract(self.timers, dt, out=self.timers, where=~over_capacity)
+        np.add(self.timers, dt, out=self.timers, where=over_capacity)
+        np.maximum(self.timers, 0.0, out=self.timers)
+
+        # A cell can trigger and clear in the same update, as with the per-cell rules
+        triggered = (self.timers >= self.config.hysteresis_time) & ~self.notified
+        self.notified |= triggered
+        cleared = self.notified & (self.ema_counts <= max(0, self.cell_capacity - self.config.alert_clear_offset))
+        self.notified &= ~cleared
+
+        if triggered.any():
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            for row, col in np.argwhere(triggered).tolist():
+                logger.warning(
+                    f"OVERCAPACITY ALERT - Cell ({row},{col}) "
+                    f"occupancy: {self.ema_counts[row, col]:.2f}/{self.cell_capacity} "
+                    f"at {timestamp}"
+                )
             self._play_audio_alert()
 
+        for row, col in np.argwhere(cleared).tolist():
+            logger.info(f"Alert cleared for cell ({row},{col})")
+
     def _play_audio_alert(self):
         """Play a siren, then announce the crowd density warning."""
         if self._audio_alert_running:
@@ -202,17 +248,34 @@ class OccupancyGrid:
         Returns:
             Tuple of (row, col) or None
         """
-        polygon, _ = self.geometry_processor.project_bbox_to_world(track.bbox)
-        if polygon is None:
-            return None
-
-        centroid = polygon.centroid
-        col = int(centroid.x // self.config.cell_width)
-        row = int(centroid.y // self.config.cell_height)
+        row, col = self.get_cells_for_tracks([track])[0].tolist()
+        return (row, col) if row >= 0 else None
 
-        if 0 <= row < self.grid_rows and 0 <= col < self.grid_cols:
-            return (row, col)
-        return None
+    def get_cells_for_tracks(self, tracks: List[TrackData]) -> np.ndarray:
+        """
+        Get grid cell coordinates for all tracks at once.
+        
+        Args:
+            tracks: Tracks to locate
+            
+        Returns:
+            Array of shape (N, 2) with (row, col) per track; -1 for tracks outside the grid
+        """
+        cells = np.full((len(tracks), 2), -1, dtype=np.int32)
+        if not tracks:
+            return cells
+
+        world_quads = self.geometry_processor.project_bboxes_to_world(
+            np.array([track.bbox for track in tracks], dtype=np.float32))
+        if world_quads is None:
+            return cells
+
+        centroids = self.geometry_processor.quad_centroids(world_quads)
+        col_row = np.floor_divide(centroids, (self.config.cell_width, self.config.cell_height)).astype(np.int32)
+        inside = ((col_row[:, 0] >= 0) & (col_row[:, 0] < self.grid_cols) &
+                  (col_row[:, 1] >= 0) & (col_row[:, 1] < self.grid_rows))
+        cells[inside] = col_row[inside, ::-1]
+        return cells
 
     def reinitialize(self, world_width: float, world_height: float):
         """
@@ -226,8 +289,8 @@ class OccupancyGrid:
         self.world_height = world_height
 
         # Recalculate grid dimensions
-        self.grid_cols = int(math.ceil(world_width / self.config.cell_width))
-        self.grid_rows = int(math.ceil(world_height / self.config.cell_height))
+        self.grid_cols = _cells_to_cover(world_width, self.config.cell_width)
+        self.grid_rows = _cells_to_cover(world_height, self.config.cell_height)
 
         # Recalculate cell capacity
         person_area = math.pi * self.config.person_radius ** 2
@@ -235,8 +298,10 @@ class OccupancyGrid:
         self.cell_capacity = max(1, int(cell_area / person_area))
 
         # Reinitialize runtime state arrays
-        self.ema_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=np.float32)
-        self.timers = np.zeros((self.grid_rows, self.grid_cols), dtype=np.float32)
+        self.ema_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
+        self.timers = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
         self.notified = np.zeros((self.grid_rows, self.grid_cols), dtype=bool)
+        self._current_counts = np.zeros((self.grid_rows, self.grid_cols), dtype=GRID_DTYPE)
+        self._cache_cell_geometry()
 
         logger.info(f"Grid reinitialized: {self.grid_rows}x{self.grid_cols} cells")
@@ -0,0 +1,144 @@
+"""
+Tests for the analytic quad-to-grid rasterizer, against hand-computed coverage and Shapely polygon intersections
+"""
+
+import numpy as np
+import pytest
+
+import geometry
+from geometry import GeometryProcessor
+
+try:
+    import shapely.geometry as shapely_geometry
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+requires_shapely = pytest.mark.skipif(not SHAPELY_AVAILABLE, reason="Shapely not installed")
+
+ROWS, COLS = 6, 8
+CELL_W, CELL_H = 1.0, 0.75
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def numba(request, monkeypatch):
+    """Run a test with the Numba kernel and with the NumPy fallback"""
+    if request.param and not geometry.NUMBA_AVAILABLE:
+        pytest.skip("Numba not installed")
+    monkeypatch.setattr(geometry, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def _unit_grid(quad, rows=3, cols=3):
+    """Coverage of one quad on a grid of 1x1 cells"""
+    return GeometryProcessor.rasterize_quads_to_grid(np.array([quad], dtype=np.float64), 1.0, 1.0, rows, cols)
+
+
+def test_unit_square_straddling_four_cells(numba):
+    # Centred on the shared corner of cells (0,0), (0,1), (1,0), (1,1): a quarter in each
+    coverage = _unit_grid([(0.5, 0.5), (1.5, 0.5), (1.5, 1.5), (0.5, 1.5)])
+
+    expected = np.zeros((3, 3))
+    expected[:2, :2] = 0.25
+    np.testing.assert_allclose(coverage, expected, atol=1e-12)
+
+
+def test_rotated_square_split_into_triangles():
+    # Diamond of area 2 around the vertex (1, 1); each cell holds a right triangle of area 0.5
+    coverage = _unit_grid([(1.0, 0.0), (2.0, 1.0), (1.0, 2.0), (0.0, 1.0)])
+
+    expected = np.zeros((3, 3))
+    expected[:2, :2] = 0.25
+    np.testing.assert_allclose(coverage, expected, atol=1e-12)
+
+
+def test_rotated_quad_off_centre():
+    # Diamond of area 2 around (1.5, 1): cells (0,1) and (1,1) each hold area 0.75,
+    # cells (0,0)/(0,2) and (1,0)/(1,2) each hold a corner triangle of area 0.125
+    coverage = _unit_grid([(1.5, 0.0), (2.5, 1.0), (1.5, 2.0), (0.5, 1.0)])
+
+    expected = np.zeros((3, 3))
+    expected[:2, 1] = 0.375
+    expected[:2, 0] = expected[:2, 2] = 0.0625
+    np.testing.assert_allclose(coverage, expected, atol=1e-12)
+    assert coverage.sum() == pytest.approx(1.0)
+
+
+def test_quad_partly_outside_grid(numba):
+    # Half of the square lies left of x = 0; only the inside half is counted
+    coverage = _unit_grid([(-0.5, 0.0), (0.5, 0.0), (0.5, 1.0), (-0.5, 1.0)])
+
+    expected = np.zeros((3, 3))
+    expected[0, 0] = 0.5
+    np.testing.assert_allclose(coverage, expected, atol=1e-12)
+
+
+def test_rotated_quad_partly_outside_grid():
+    # Diamond around the origin: only the quarter inside cell (0,0) is counted
+    coverage = _unit_grid([(0.0, -1.0), (1.0, 0.0), (0.0, 1.0), (-1.0, 0.0)])
+
+    expected = np.zeros((3, 3))
+    expected[0, 0] = 0.25
+    np.testing.assert_allclose(coverage, expected, atol=1e-12)
+
+
+def test_quad_entirely_outside_grid_contributes_nothing(numba):
+    coverage = _unit_grid([(5.0, 5.0), (6.0, 5.0), (6.0, 6.0), (5.0, 6.0)])
+    assert not coverage.any()
+
+
+def _shapely_coverage(quads):
+    """Reference coverage: per-cell intersection area / quad area, summed over quads"""
+    coverage = np.zeros((ROWS, COLS))
+    for quad in quads:
+        polygon = shapely_geometry.Polygon(quad)
+        if polygon.area <= 1e-6:
+            continue
+        for row in range(ROWS):
+            for col in range(COLS):
+                cell = shapely_geometry.box(col * CELL_W, row * CELL_H, (col + 1) * CELL_W, (row + 1) * CELL_H)
+                coverage[row, col] += polygon.intersection(cell).area / polygon.area
+    return coverage
+
+
+def _rotated_quads(rng, count):
+    """Random convex quads: rotated rectangles, some reaching past the grid edges"""
+    quads = []
+    for _ in range(count):
+        cx, cy = rng.uniform(-0.5, COLS * CELL_W + 0.5), rng.uniform(-0.5, ROWS * CELL_H + 0.5)
+        w, h = rng.uniform(0.2, 2.5, size=2)
+        angle = rng.uniform(0, np.pi)
+        c, s = np.cos(angle), np.sin(angle)
+        corners = np.array([(-w, -h), (w, -h), (w, h), (-w, h)]) / 2
+        quads.append(corners @ np.array([[c, s], [-s, c]]) + (cx, cy))
+    return np.array(quads)
+
+
+def _axis_aligned_quads(rng, count):
+    """Random axis-aligned rectangles, clockwise from top-left like projected bboxes"""
+    x0, y0 = rng.uniform(-0.5, COLS * CELL_W, size=count), rng.uniform(-0.5, ROWS * CELL_H, size=count)
+    x1, y1 = x0 + rng.uniform(0.1, 3.0, size=count), y0 + rng.uniform(0.1, 3.0, size=count)
+    return np.stack([np.stack(p, axis=1) for p in ((x0, y0), (x1, y0), (x1, y1), (x0, y1))], axis=1)
+
+
+@requires_shapely
+def test_rotated_quads_match_shapely():
+    quads = _rotated_quads(np.random.default_rng(7), 40)
+    coverage = GeometryProcessor.rasterize_quads_to_grid(quads, CELL_W, CELL_H, ROWS, COLS)
+    np.testing.assert_allclose(coverage, _shapely_coverage(quads), atol=1e-9)
+
+
+@requires_shapely
+def test_axis_aligned_quads_match_shapely(numba):
+    quads = _axis_aligned_quads(np.random.default_rng(11), 40)
+    coverage = GeometryProcessor.rasterize_quads_to_grid(quads, CELL_W, CELL_H, ROWS, COLS)
+    np.testing.assert_allclose(coverage, _shapely_coverage(quads), atol=1e-9)
+
+
+@requires_shapely
+def test_mixed_and_degenerate_quads_match_shapely():
+    rng = np.random.default_rng(3)
+    degenerate = np.array([[(1.0, 1.0), (2.0, 1.0), (2.0, 1.0), (1.0, 1.0)]])
+    quads = np.concatenate([_rotated_quads(rng, 10), _axis_aligned_quads(rng, 10), degenerate])
+    coverage = GeometryProcessor.rasterize_quads_to_grid(quads, CELL_W, CELL_H, ROWS, COLS)
+    np.testing.assert_allclose(coverage, _shapely_coverage(quads), atol=1e-9)
@@ -0,0 +1,134 @@
+"""
+Tests for LicenseManager's validation cache and signature compatibility
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+
+import pytest
+
+# Add auth directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'auth'))
+
+import license_manager
+from license_manager import LicenseManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = LicenseManager(license_file=tmp_path / 'license.dat')
+    manager.save_license(manager.generate_license(manager.get_machine_id(), validity_days=30,
+                                                  customer_name="Cache Test"))
+    return manager
+
+
+def _rewrite(manager, license_data, bump_ns=1_000_000_000):
+    """Rewrite the license file and move its mtime forward so the stamp changes on any filesystem"""
+    st = manager.license_file.stat()
+    manager.license_file.write_text(json.dumps(license_data, indent=2), encoding='utf-8')
+    os.utime(manager.license_file, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_unchanged_file_is_served_from_cache(manager, monkeypatch):
+    assert manager.validate_license()[0]
+
+    def fail_load():
+        raise AssertionError("license file re-read despite an unchanged stamp")
+
+    monkeypatch.setattr(manager, 'load_license', fail_load)
+    valid, message = manager.validate_license()
+    assert valid and message.startswith("License valid")
+
+
+def test_rewritten_file_is_revalidated(manager):
+    assert manager.validate_license()[0]
+
+    tampered = json.loads(manager.license_file.read_text(encoding='utf-8'))
+    tampered['customer_name'] = "Cache Tesu"  # same-length edit
+    _rewrite(manager, tampered)
+
+    assert manager.validate_license() == (False, "Invalid license signature")
+    assert manager._validate_cache is None
+
+
+def test_removed_file_is_not_served_from_cache(manager):
+    assert manager.validate_license()[0]
+    manager.license_file.unlink()
+
+    assert manager.validate_license() == (False, "No license found")
+
+
+def test_get_status_shares_the_cache(manager, monkeypatch):
+    info, status = manager.get_status()
+    assert info['customer_name'] == "Cache Test" and status[0]
+    assert manager._validate_cache is not None
+
+    # A cache hit skips the signature check entirely
+    monkeypatch.setattr(manager, '_validate_dict', lambda data: pytest.fail("cache not used"))
+    assert manager.validate_license()[0]
+    assert manager.get_status()[1][0]
+
+
+# Signed by the original implementation: hmac.new(salt, json.dumps(data, sort_keys=True).encode(), sha256)
+ISSUED_LICENSE = {
+    'machine_id': '0123456789abcdef0123456789abcdef',
+    'mac_address': 'AA:BB:CC:DD:EE:FF',
+    'username': 'operator',
+    'customer_name': 'Caf\u00e9 Nord \u2013 Gate A',
+    'created': '2025-01-01T09:30:00',
+    'expires': '2026-01-01T09:30:00',
+    'valid': True,
+    'seats': 3,
+}
+ISSUED_SIGNATURE = '75f1f80b34d65b429d07a00f35281c85337af814fde1e9d39b5ae18776342c0f'
+
+
+def _reference_signature(data):
+    """Signature exactly as the original LicenseManager computed it"""
+    data_str = json.dumps(data, sort_keys=True)
+    return hmac.new(license_manager._SECRET_SALT, data_str.encode(), hashlib.sha256).hexdigest()
+
+
+def test_signature_matches_previously_issued_license(tmp_path):
+    manager = LicenseManager(license_file=tmp_path / 'license.dat')
+
+    assert manager.generate_signature(ISSUED_LICENSE) == ISSUED_SIGNATURE
+    assert manager.generate_signature(dict(ISSUED_LICENSE, signature=ISSUED_SIGNATURE)) == ISSUED_SIGNATURE
+    assert manager.verify_signature(ISSUED_LICENSE, ISSUED_SIGNATURE)
+    assert not manager.verify_signature(dict(ISSUED_LICENSE, seats=4), ISSUED_SIGNATURE)
+    assert not manager.verify_signature(ISSUED_LICENSE, 'not-hex')
+
+
+def test_generated_licenses_verify_with_reference_signature(tmp_path):
+    manager = LicenseManager(license_file=tmp_path / 'license.dat')
+    licenses = [json.loads(manager.generate_license(manager.get_machine_id(), 30, "Single"))]
+    licenses += [json.loads(text) for text in manager.generate_licenses(
+        [(manager.get_machine_id(), 30, "Batch A"), ('f' * 32, 365, "Batch \u00e9")])]
+
+    for data in licenses:
+        signature = data.pop('signature')
+        assert signature == _reference_signature(data)
+
+
+def test_reference_signed_license_validates(tmp_path):
+    manager = LicenseManager(license_file=tmp_path / 'license.dat')
+    data = dict(ISSUED_LICENSE, machine_id=manager.get_machine_id(), expires='2999-01-01T00:00:00')
+    data['signature'] = _reference_signature(data)
+    manager.save_license(json.dumps(data, indent=2))
+
+    valid, message = manager.validate_license()
+    assert valid, message
+
+
+@pytest.mark.parametrize("key", [b'', b'short', b'k' * 64, bytes(range(200))])
+def test_prehashed_pad_states_match_hmac(key):
+    inner_proto, outer_proto = license_manager._hmac_pad_states(key)
+    for message in (b'', b'{"a": 1}', bytes(range(256)) * 3):
+        inner = inner_proto.copy()
+        inner.update(message)
+        outer = outer_proto.copy()
+        outer.update(inner.digest())
+        assert outer.digest() == hmac.new(key, message, hashlib.sha256).digest()
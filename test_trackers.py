@@ -0,0 +1,109 @@
+"""
+Tests for the centroid tracker's distance gate and optimal assignment
+"""
+
+import math
+
+import numpy as np
+
+from trackers import SimpleCentroidTracker
+
+THRESHOLD = 80.0
+
+
+def _box(x, y, half=5.0):
+    """Detection row whose centroid is (x, y)"""
+    return [x - half, y - half, x + half, y + half, 0.9]
+
+
+def _tracker_with(points):
+    """Tracker holding one track per point, IDs 1..N in order"""
+    tracker = SimpleCentroidTracker(max_age=30, distance_threshold=THRESHOLD)
+    tracker.update_tracks([_box(x, y) for x, y in points])
+    return tracker
+
+
+def _greedy_matches(track_points, det_points, threshold):
+    """Reference port of the original greedy matcher: {track index: detection index}"""
+    used, matches = set(), {}
+    for t, (tx, ty) in enumerate(track_points):
+        best, best_distance = None, float('inf')
+        for d, (dx, dy) in enumerate(det_points):
+            if d in used:
+                continue
+            distance = math.sqrt((tx - dx) ** 2 + (ty - dy) ** 2)
+            if distance < best_distance and distance < threshold:
+                best, best_distance = d, distance
+        if best is not None:
+            used.add(best)
+            matches[t] = best
+    return matches
+
+
+def _tracker_matches(tracker, track_points, det_points):
+    """Run one update and recover {track index: detection index} from surviving track IDs"""
+    tracks = tracker.update_tracks([_box(x, y) for x, y in det_points])
+    matches = {}
+    for track in tracks:
+        if track.track_id <= len(track_points) and track.age == 0:
+            position = np.array(track.world_position)
+            distances = np.linalg.norm(np.asarray(det_points, dtype=np.float64) - position, axis=1)
+            matches[track.track_id - 1] = int(np.argmin(distances))
+    return matches
+
+
+def _total_cost(matches, track_points, det_points):
+    """Sum of squared matched distances, the cost the tracker minimizes"""
+    return sum(math.dist(track_points[t], det_points[d]) ** 2 for t, d in matches.items())
+
+
+def test_detection_exactly_at_threshold_is_not_matched():
+    tracker = _tracker_with([(100.0, 100.0)])
+    tracks = tracker.update_tracks([_box(100.0 + THRESHOLD, 100.0)])
+
+    assert sorted(track.track_id for track in tracks) == [1, 2]
+    assert next(track for track in tracks if track.track_id == 1).age == 1
+
+
+def test_detection_just_inside_threshold_is_matched():
+    tracker = _tracker_with([(100.0, 100.0)])
+    tracks = tracker.update_tracks([_box(100.0 + THRESHOLD - 0.5, 100.0)])
+
+    assert [(track.track_id, track.age) for track in tracks] == [(1, 0)]
+
+
+def test_assignment_keeps_tracks_that_greedy_matching_drops():
+    # Greedy gives track 0 its nearest detection, leaving track 1 out of range of the other
+    track_points = [(0.0, 0.0), (40.0, 0.0)]
+    det_points = [(30.0, 0.0), (-45.0, 0.0)]
+
+    assert len(_greedy_matches(track_points, det_points, THRESHOLD)) == 1
+    matches = _tracker_matches(_tracker_with(track_points), track_points, det_points)
+    assert matches == {0: 1, 1: 0}
+
+
+def test_assignment_never_worse_than_greedy():
+    rng = np.random.default_rng(1234)
+    for _ in range(200):
+        track_points = [tuple(p) for p in rng.uniform(0, 300, size=(rng.integers(1, 8), 2))]
+        det_points = [tuple(p) for p in rng.uniform(0, 300, size=(rng.integers(1, 8), 2))]
+
+        greedy = _greedy_matches(track_points, det_points, THRESHOLD)
+        optimal = _tracker_matches(_tracker_with(track_points), track_points, det_points)
+
+        # More pairs kept first, then a total cost no larger than greedy's
+        assert len(optimal) >= len(greedy)
+        if len(optimal) == len(greedy):
+            assert (_total_cost(optimal, track_points, det_points)
+                    <= _total_cost(greedy, track_points, det_points) + 1e-2)
+
+
+def test_large_threshold_keeps_distant_matches():
+    # Squared distances past 1e6 must still count as in-gate matches
+    tracker = SimpleCentroidTracker(max_age=30, distance_threshold=1500.0)
+    tracker.update_tracks([_box(100.0, 100.0), _box(3000.0, 100.0)])
+    tracks = tracker.update_tracks([_box(1300.0, 100.0), _box(3000.0, 1400.0)])
+
+    assert sorted((track.track_id, track.age) for track in tracks) == [(1, 0), (2, 0)]
+    positions = {track.track_id: tuple(track.world_position) for track in tracks}
+    assert positions == {1: (1300.0, 100.0), 2: (3000.0, 1400.0)}
@@ -0,0 +1,29 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Ahead-of-time compiled centroid tracker kernels.
+
+Drop-in replacement for the Numba kernel in trackers.py on targets where JIT
+warm-up is too costly. Build in place with:
+
+    cythonize -i tracker_core.pyx
+
+trackers.py uses the compiled module automatically when it is importable.
+"""
+
+def build_cost(const float[:, ::1] tracks_xy, const float[:, ::1] dets_xy, float thresh2,
+               float gated, float[:, :] out):
+    """Fill out[i, j] with squared track-detection distance; pairs at or beyond thresh2 cost gated"""
+    cdef Py_ssize_t n_tracks = tracks_xy.shape[0]
+    cdef Py_ssize_t n_dets = dets_xy.shape[0]
+    cdef Py_ssize_t i, j
+    cdef float tx, ty, dx, dy, d2
+
+    with nogil:
+        for i in range(n_tracks):
+            tx = tracks_xy[i, 0]
+            ty = tracks_xy[i, 1]
+            for j in range(n_dets):
+                dx = tx - dets_xy[j, 0]
+                dy = ty - dets_xy[j, 1]
+                d2 = dx * dx + dy * dy
+                out[i, j] = d2 if d2 < thresh2 else gated
@@ -3,16 +3,52 @@ Tracking module for person tracking across frames.
 Supports both simple centroid tracking and DeepSort.
 """
 
-import math
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
 from config import TrackData
+from jit_utils import NUMBA_AVAILABLE, njit
 from logger_config import get_logger
 
 logger = get_logger(__name__)
 
+# Minimum cost assigned to track/detection pairs outside the distance gate
+_GATED_COST = 1e6
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, parallel=False)
+    def _build_cost(tracks_xy, dets_xy, thresh2, gated, out):
+        """Fill out[i, j] with squared track-detection distance; pairs at or beyond thresh2 cost gated"""
+        for i in range(tracks_xy.shape[0]):
+            tx = tracks_xy[i, 0]
+            ty = tracks_xy[i, 1]
+            for j in range(dets_xy.shape[0]):
+                dx = tx - dets_xy[j, 0]
+                dy = ty - dets_xy[j, 1]
+                d2 = dx * dx + dy * dy
+                out[i, j] = d2 if d2 < thresh2 else gated
+else:
+    def _build_cost(tracks_xy, dets_xy, thresh2, gated, out):
+        """Fill out[i, j] with squared track-detection distance; pairs at or beyond thresh2 cost gated"""
+        diff = tracks_xy[:, None, :] - dets_xy[None, :, :]
+        np.einsum('ijk,ijk->ij', diff, diff, out=out)
+        out[out >= thresh2] = gated
+
+# Prefer the ahead-of-time compiled kernel (tracker_core.pyx) when it has been built
+try:
+    from tracker_core import build_cost as _build_cost
+
+    TRACKER_CORE_AVAILABLE = True
+except ImportError:
+    TRACKER_CORE_AVAILABLE = False
+
+if TRACKER_CORE_AVAILABLE:
+    logger.info("Centroid tracker cost kernel: compiled tracker_core")
+else:
+    logger.info(f"Centroid tracker cost kernel: {'Numba' if NUMBA_AVAILABLE else 'NumPy'}")
+
 # Import DeepSort with comprehensive error handling
 try:
     from deep_sort_realtime.deepsort_tracker import DeepSort
@@ -27,118 +63,177 @@ except ImportError as e:
 
 
 class SimpleCentroidTracker:
-    """Optimized centroid-based tracker with better performance"""
+    """Centroid-based tracker using optimal track-detection assignment.
 
-    def __init__(self, max_age: int = 30, distance_threshold: float = 80.0):
+    Track state is kept as parallel NumPy arrays (structure of arrays) so that
+    matching, aging and expiry are vectorized; TrackData objects are only built
+    when tracks are returned to the caller.
+    """
+
+    def __init__(self, max_age: int = 30, distance_threshold: float = 80.0, capacity: int = 256):
         """
         Initialize simple centroid tracker.
         
         Args:
             max_age: Maximum frames to keep track without detection
             distance_threshold: Maximum distance for track-detection matching
+            capacity: Initial number of track slots (grows as needed)
         """
         self.next_id = 1
-        self.tracks: Dict[int, TrackData] = {}
         self.max_age = max_age
         self.distance_threshold = distance_threshold
-
-    def update_tracks(self, detections: List[List[float]], frame: Optional[np.ndarray] = None) -> List[TrackData]:
+        # Matching compares squared distances, so square the gate once
+        self._thresh2 = np.float32(distance_threshold * distance_threshold)
+        # Gated pairs must cost more than any in-gate pair, however large the threshold
+        self._gated_cost = np.float32(max(_GATED_COST, 2.0 * self._thresh2))
+        self._cost_buf = np.empty((64, 64), dtype=np.float32)
+
+        # Track state (first self._n rows are live)
+        self._cap = capacity
+        self._n = 0
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._bbox = np.empty((capacity, 4), dtype=np.int32)
+        self._pos = np.empty((capacity, 2), dtype=np.float32)
+        self._conf = np.empty(capacity, dtype=np.float64)
+        self._age = np.empty(capacity, dtype=np.int32)
+
+    @property
+    def tracks(self) -> Dict[int, TrackData]:
+        """Current tracks keyed by track ID"""
+        return {track.track_id: track for track in self._export_tracks()}
+
+    def update_tracks(self, detections: Union[List[List[float]], np.ndarray],
+                      frame: Optional[np.ndarray] = None) -> List[TrackData]:
         """
         Update tracks with new detections using optimized algorithm.
         
         Args:
-            detections: List of detections as [x1, y1, x2, y2, confidence]
+            detections: Detections as [x1, y1, x2, y2, confidence] rows (list or (D, 4|5) array)
             frame: Optional frame for appearance-based tracking (unused in centroid)
             
         Returns:
             List of current TrackData objects
         """
-        if not detections:
+        if len(detections) == 0:
             self._age_tracks()
-            return list(self.tracks.values())
+            return self._export_tracks()
+
+        dets = self._to_detection_array(detections)
 
         # Extract centroids efficiently
-        centroids = [(det, (det[0] + det[2]) / 2, (det[1] + det[3]) / 2)
-                     for det in detections if len(det) >= 4]
+        det_xy = np.empty((len(dets), 2), dtype=np.float32)
+        det_xy[:, 0] = 0.5 * (dets[:, 0] + dets[:, 2])
+        det_xy[:, 1] = 0.5 * (dets[:, 1] + dets[:, 3])
 
-        if not self.tracks:
+        if self._n == 0:
             # Initialize tracks for first frame
-            self._create_initial_tracks(centroids)
+            self._append_tracks(dets, det_xy)
         else:
             # Match existing tracks to detections
-            self._match_tracks_to_detections(centroids)
+            self._match_tracks_to_detections(dets, det_xy)
 
         self._remove_old_tracks()
-        return list(self.tracks.values())
-
-    def _create_initial_tracks(self, centroids: List[Tuple[List[float], float, float]]):
-        """Create initial tracks for first frame"""
-        for det, cx, cy in centroids:
-            self.tracks[self.next_id] = TrackData(
-                track_id=self.next_id,
-                bbox=(int(det[0]), int(det[1]), int(det[2]), int(det[3])),
-                world_position=(cx, cy),
-                confidence=det[4] if len(det) > 4 else 1.0
-            )
-            self.next_id += 1
-
-    def _match_tracks_to_detections(self, centroids: List[Tuple[List[float], float, float]]):
-        """Match existing tracks to new detections using greedy algorithm"""
-        used_detections = set()
-
-        # Simple greedy matching - could be improved with Hungarian algorithm
-        for track_id, track in list(self.tracks.items()):
-            best_match = None
-            best_distance = float('inf')
-
-            for i, (det, cx, cy) in enumerate(centroids):
-                if i in used_detections:
-                    continue
-
-                # Calculate Euclidean distance
-                distance = math.sqrt(
-                    (track.world_position[0] - cx) ** 2 +
-                    (track.world_position[1] - cy) ** 2
-                )
-
-                if distance < best_distance and distance < self.distance_threshold:
-                    best_distance = distance
-                    best_match = (i, det, cx, cy)
-
-            if best_match:
-                i, det, cx, cy = best_match
-                used_detections.add(i)
-
-                # Update track
-                track.bbox = (int(det[0]), int(det[1]), int(det[2]), int(det[3]))
-                track.world_position = (cx, cy)
-                track.confidence = det[4] if len(det) > 4 else 1.0
-                track.age = 0
-            else:
-                track.age += 1
+        return self._export_tracks()
+
+    @staticmethod
+    def _to_detection_array(detections: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """Convert detections to a (D, 5) float array, defaulting missing confidences to 1.0"""
+        if isinstance(detections, np.ndarray) and detections.ndim == 2 and detections.shape[1] >= 4:
+            dets = np.ones((len(detections), 5), dtype=np.float64)
+            dets[:, :min(5, detections.shape[1])] = detections[:, :5]
+            return dets
+
+        rows = [(det[0], det[1], det[2], det[3], det[4] if len(det) > 4 else 1.0)
+                for det in detections if len(det) >= 4]
+        return np.asarray(rows, dtype=np.float64).reshape(-1, 5)
+
+    def _match_tracks_to_detections(self, dets: np.ndarray, det_xy: np.ndarray):
+        """Match existing tracks to new detections using optimal (Hungarian) assignment"""
+        n = self._n
+
+        # Squared distances keep the assignment order without a sqrt per pair
+        cost = self._get_cost_buffer(n, len(det_xy))
+        _build_cost(self._pos[:n], det_xy, self._thresh2, self._gated_cost, cost)
+
+        row_ind, col_ind = linear_sum_assignment(cost)
+        valid = cost[row_ind, col_ind] < self._thresh2
+        rows, cols = row_ind[valid], col_ind[valid]
+
+        # Age unmatched tracks, reset and update matched ones
+        self._age[:n] += 1
+        self._age[rows] = 0
+        self._bbox[rows] = dets[cols, :4].astype(np.int32)
+        self._pos[rows] = det_xy[cols]
+        self._conf[rows] = dets[cols, 4]
 
         # Create new tracks for unmatched detections
-        for i, (det, cx, cy) in enumerate(centroids):
-            if i not in used_detections:
-                self.tracks[self.next_id] = TrackData(
-                    track_id=self.next_id,
-                    bbox=(int(det[0]), int(det[1]), int(det[2]), int(det[3])),
-                    world_position=(cx, cy),
-                    confidence=det[4] if len(det) > 4 else 1.0
-                )
-                self.next_id += 1
+        unmatched = np.ones(len(dets), dtype=bool)
+        unmatched[cols] = False
+        if unmatched.any():
+            self._append_tracks(dets[unmatched], det_xy[unmatched])
+
+    def _append_tracks(self, dets: np.ndarray, det_xy: np.ndarray):
+        """Append new tracks for the given detections"""
+        count = len(dets)
+        self._ensure_capacity(self._n + count)
+
+        start, end = self._n, self._n + count
+        self._ids[start:end] = np.arange(self.next_id, self.next_id + count)
+        self._bbox[start:end] = dets[:, :4].astype(np.int32)
+        self._pos[start:end] = det_xy
+        self._conf[start:end] = dets[:, 4]
+        self._age[start:end] = 0
+
+        self._n = end
+        self.next_id += count
+
+    def _ensure_capacity(self, required: int):
+        """Grow the track arrays to hold at least `required` tracks"""
+        if required <= self._cap:
+            return
+
+        new_cap = max(required, self._cap * 2)
+        for name in ('_ids', '_bbox', '_pos', '_conf', '_age'):
+            old = getattr(self, name)
+            grown = np.empty((new_cap,) + old.shape[1:], dtype=old.dtype)
+            grown[:self._n] = old[:self._n]
+            setattr(self, name, grown)
+        self._cap = new_cap
+
+    def _export_tracks(self) -> List[TrackData]:
+        """Build TrackData objects for the live tracks"""
+        n = self._n
+        return [
+            TrackData(track_id=track_id, bbox=tuple(bbox), world_position=tuple(pos),
+                      confidence=conf, age=age)
+            for track_id, bbox, pos, conf, age in zip(
+                self._ids[:n].tolist(), self._bbox[:n].tolist(), self._pos[:n].tolist(),
+                self._conf[:n].tolist(), self._age[:n].tolist())
+        ]
+
+    def _get_cost_buffer(self, n_tracks: int, n_dets: int) -> np.ndarray:
+        """Return a (n_tracks, n_dets) view of the reusable cost buffer, growing it if needed"""
+        rows, cols = self._cost_buf.shape
+        if n_tracks > rows or n_dets > cols:
+            self._cost_buf = np.empty((max(n_tracks, rows * 2), max(n_dets, cols * 2)), dtype=np.float32)
+        return self._cost_buf[:n_tracks, :n_dets]
 
     def _age_tracks(self):
         """Age all tracks when no detections are available"""
-        for track in self.tracks.values():
-            track.age += 1
+        self._age[:self._n] += 1
 
     def _remove_old_tracks(self):
-        """Remove tracks that are too old"""
-        expired_tracks = [track_id for track_id, track in self.tracks.items()
-                          if track.age > self.max_age]
-        for track_id in expired_tracks:
-            del self.tracks[track_id]
+        """Remove tracks that are too old, compacting the track arrays"""
+        n = self._n
+        keep = self._age[:n] <= self.max_age
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+
+        for name in ('_ids', '_bbox', '_pos', '_conf', '_age'):
+            arr = getattr(self, name)
+            arr[:kept] = arr[:n][keep]
+        self._n = kept
 
 
 class DeepSortTracker:
@@ -211,8 +306,9 @@ class DeepSortTracker:
 
                 tracks = self.tracker.update_tracks(formatted_detections, frame=frame)
 
-            # Convert to TrackData format
-            track_data_list = []
+            # Collect confirmed tracks, then convert all boxes to ints in one pass
+            track_ids = []
+            raw_boxes = []
             for track in tracks:
                 if hasattr(track, 'is_confirmed') and not track.is_confirmed():
                     continue
@@ -221,44 +317,46 @@ class DeepSortTracker:
                 if track_id is None:
                     continue
 
-                # Get bounding box
-                bbox = self._extract_bbox(track)
-                if bbox is None:
+                ltrb = self._extract_ltrb(track)
+                if ltrb is None:
                     continue
 
-                x1, y1, x2, y2 = bbox
-                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+                track_ids.append(track_id)
+                raw_boxes.append(ltrb)
+
+            if not track_ids:
+                return []
 
-                track_data_list.append(TrackData(
-                    track_id=track_id,
-                    bbox=bbox,
-                    world_position=(cx, cy),
-                    confidence=1.0
-                ))
+            # Truncate toward zero like int() and compute centers in bulk
+            boxes = np.asarray(raw_boxes, dtype=np.float64).astype(np.int32)
+            centers = (boxes[:, :2] + boxes[:, 2:]) / 2
 
-            return track_data_list
+            return [
+                TrackData(track_id=track_id, bbox=tuple(bbox), world_position=tuple(center), confidence=1.0)
+                for track_id, bbox, center in zip(track_ids, boxes.tolist(), centers.tolist())
+            ]
 
         except Exception as e:
             logger.error(f"DeepSort tracking error: {e}")
             return []
 
-    def _extract_bbox(self, track) -> Optional[Tuple[int, int, int, int]]:
-        """Extract bounding box from track object"""
+    def _extract_ltrb(self, track) -> Optional[Tuple[float, float, float, float]]:
+        """Extract raw (left, top, right, bottom) box from track object"""
         try:
             if hasattr(track, 'to_tlbr'):
-                tlbr = track.to_tlbr()
-                return int(tlbr[0]), int(tlbr[1]), int(tlbr[2]), int(tlbr[3])
+                x1, y1, x2, y2 = map(float, track.to_tlbr()[:4])
+                return x1, y1, x2, y2
             elif hasattr(track, 'to_ltrb'):
-                ltrb = track.to_ltrb()
-                return int(ltrb[0]), int(ltrb[1]), int(ltrb[2]), int(ltrb[3])
+                x1, y1, x2, y2 = map(float, track.to_ltrb()[:4])
+                return x1, y1, x2, y2
             elif hasattr(track, 'to_ltwh'):
-                ltwh = track.to_ltwh()
-                x1, y1, w, h = ltwh
-                return int(x1), int(y1), int(x1 + w), int(y1 + h)
+                x1, y1, w, h = map(float, track.to_ltwh()[:4])
+                return x1, y1, x1 + w, y1 + h
             elif hasattr(track, 'bbox'):
                 bbox = track.bbox
                 if len(bbox) == 4:
-                    return tuple(map(int, bbox))
+                    x1, y1, x2, y2 = map(float, bbox)
+                    return x1, y1, x2, y2
         except Exception as e:
             logger.warning(f"Failed to extract bbox: {e}")
 
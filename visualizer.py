@@ -4,12 +4,13 @@ Handles all drawing and display operations.
 """
 
 import time
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
 from config import MonitoringConfig, TrackData
+from fps_utils import compute_fps
 from geometry import GeometryProcessor
 from logger_config import get_logger
 from occupancy import OccupancyGrid
@@ -17,6 +18,13 @@ from trackers import DeepSortTracker
 
 logger = get_logger(__name__)
 
+# Occupancy color LUT resolution: entries per unit of occupancy/capacity. A multiple
+# of 10 keeps the 0.1/0.5/0.8/1.0 color thresholds on exact entry boundaries.
+OCCUPANCY_LUT_STEPS = 640
+
+# Maximum number of cached label sizes
+TEXT_SIZE_CACHE_LIMIT = 4096
+
 
 class MonitorVisualizer:
     """Handles all visualization and rendering operations"""
@@ -34,8 +42,42 @@ class MonitorVisualizer:
         self.camera_width = camera_width
         self.camera_height = camera_height
 
+        # Grid lines rasterized once and composited per frame (see draw_grid_overlay)
+        self._grid_layer: Optional[np.ndarray] = None
+        self._grid_mask: Optional[np.ndarray] = None
+        self._grid_layer_key = None
+
+        # Bird's eye cell pixel coordinates for the current grid and scale
+        self._birdseye_axes = None
+        self._birdseye_axes_key = None
+
+        # Info panel with everything except the per-frame line pre-drawn
+        self._info_panel: Optional[np.ndarray] = None
+        self._info_panel_key = None
+
+        # getTextSize results for the HERSHEY_SIMPLEX labels, keyed by (text, scale, thickness)
+        self._text_sizes: dict = {}
+        self._birdseye_index = None
+        self._birdseye_index_key = None
+
+        # Blended background + heat map, refilled only where a cell's color changes
+        self._heatmap: Optional[np.ndarray] = None
+        self._heatmap_lut_index: Optional[np.ndarray] = None
+        self._heatmap_row_spans = None
+        self._heatmap_col_spans = None
+        self._heatmap_key = None
+
+        # Occupancy colors for fractions 0..2 of capacity (saturated beyond)
+        self._occ_lut = self._get_occupancy_colors(
+            np.arange(2 * OCCUPANCY_LUT_STEPS + 1) / OCCUPANCY_LUT_STEPS, 1)
+
+        # Static bird's eye gridlines and (row,col) labels, copied through their mask per frame
+        self._birdseye_skeleton: Optional[np.ndarray] = None
+        self._birdseye_skeleton_mask: Optional[np.ndarray] = None
+        self._birdseye_skeleton_key = None
+
     def draw_grid_overlay(self, view: np.ndarray, geometry_processor: GeometryProcessor,
-                          occupancy_grid: OccupancyGrid):
+                          occupancy_grid: OccupancyGrid, scale: float = 1.0):
         """
         Draw grid lines on camera view.
         
@@ -43,43 +85,77 @@ class MonitorVisualizer:
             view: Image to draw on
             geometry_processor: Geometry processor for coordinate conversion
             occupancy_grid: Occupancy grid for dimensions
+            scale: View size relative to the camera frame (e.g. 0.5 for split view tiles)
+        """
+        key = (view.shape, scale, occupancy_grid.grid_rows, occupancy_grid.grid_cols,
+               occupancy_grid.world_width, occupancy_grid.world_height,
+               self.config.cell_width, self.config.cell_height,
+               tuple(self.config.grid_color), self.config.grid_line_thickness,
+               geometry_processor.inv_H_matrix.tobytes())
+        if key != self._grid_layer_key:
+            self._grid_layer, self._grid_mask = self._render_grid_layer(view.shape, geometry_processor,
+                                                                        occupancy_grid, scale)
+            self._grid_layer_key = key
+
+        if self._grid_layer is not None:
+            cv2.copyTo(self._grid_layer, self._grid_mask, view)
+
+    def _render_grid_layer(self, shape: Tuple[int, ...], geometry_processor: GeometryProcessor,
+                           occupancy_grid: OccupancyGrid,
+                           scale: float = 1.0) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Rasterize the grid lines once into a color layer and coverage mask.
+        
+        Args:
+            shape: Shape of the views the layer will be composited onto
+            geometry_processor: Geometry processor for coordinate conversion
+            occupancy_grid: Occupancy grid for dimensions
+            scale: View size relative to the camera frame
+            
+        Returns:
+            Tuple of (layer, mask), or (None, None) if projection failed
         """
         grid_color = self.config.grid_color
-        thickness = self.config.grid_line_thickness
-
-        for i in range(occupancy_grid.grid_rows + 1):
-            y_world = i * self.config.cell_height
-            try:
-                x1, y1 = geometry_processor.world_to_image_point(0.0, y_world)
-                x2, y2 = geometry_processor.world_to_image_point(occupancy_grid.world_width, y_world)
-                cv2.line(view, (x1, y1), (x2, y2), grid_color, thickness)
-            except Exception:
-                pass
-
-        for j in range(occupancy_grid.grid_cols + 1):
-            x_world = j * self.config.cell_width
-            try:
-                x1, y1 = geometry_processor.world_to_image_point(x_world, 0.0)
-                x2, y2 = geometry_processor.world_to_image_point(x_world, occupancy_grid.world_height)
-                cv2.line(view, (x1, y1), (x2, y2), grid_color, thickness)
-            except Exception:
-                pass
-
-    def draw_simple_track_annotation(self, view: np.ndarray, track: TrackData):
+        thickness = self._scaled(self.config.grid_line_thickness, scale)
+
+        image_points = occupancy_grid.grid_line_endpoints
+        if not len(image_points):
+            return None, None
+        if scale != 1.0:
+            image_points = np.rint(image_points * scale).astype(np.int32)
+
+        layer = np.zeros(shape, dtype=np.uint8)
+        mask = np.zeros(shape[:2], dtype=np.uint8)
+        for x1, y1, x2, y2 in image_points.tolist():
+            cv2.line(layer, (x1, y1), (x2, y2), grid_color, thickness)
+            cv2.line(mask, (x1, y1), (x2, y2), 255, thickness)
+        return layer, mask
+
+    def draw_simple_track_annotation(self, view: np.ndarray, track: TrackData, scale: float = 1.0):
         """
         Draw simple track bounding box and ID.
         
         Args:
             view: Image to draw on
             track: Track to visualize
+            scale: View size relative to the camera frame (e.g. 0.5 for split view tiles)
         """
-        x1, y1, x2, y2 = track.bbox
-        cv2.rectangle(view, (x1, y1), (x2, y2), self.config.bbox_color, self.config.bbox_thickness)
+        x1, y1, x2, y2 = (self._scaled(v, scale, 0) for v in track.bbox)
+        cv2.rectangle(view, (x1, y1), (x2, y2), self.config.bbox_color,
+                      self._scaled(self.config.bbox_thickness, scale))
         id_text = f"ID:{track.track_id}"
-        text_size = cv2.getTextSize(id_text, cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_medium, 2)[0]
-        cv2.rectangle(view, (x1, y1 - 30), (x1 + text_size[0] + 10, y1), self.config.track_id_bg_color, -1)
-        cv2.putText(view, id_text, (x1 + 5, y1 - 8), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_medium,
-                    self.config.track_id_text_color, 2)
+        font_size = self.config.font_size_medium * scale
+        text_thickness = self._scaled(2, scale)
+        text_size = self._text_size(id_text, font_size, text_thickness)
+        cv2.rectangle(view, (x1, y1 - self._scaled(30, scale)),
+                      (x1 + text_size[0] + self._scaled(10, scale), y1), self.config.track_id_bg_color, -1)
+        cv2.putText(view, id_text, (x1 + self._scaled(5, scale), y1 - self._scaled(8, scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, font_size, self.config.track_id_text_color, text_thickness)
+
+    @staticmethod
+    def _scaled(value: float, scale: float, minimum: int = 1) -> int:
+        """Scale a pixel length or coordinate, rounding to an int no smaller than minimum"""
+        return max(minimum, int(round(value * scale)))
 
     def draw_track_annotation(self, view: np.ndarray, track: TrackData, occupancy_grid: OccupancyGrid):
         """
@@ -90,24 +166,58 @@ class MonitorVisualizer:
             track: Track to visualize
             occupancy_grid: Occupancy grid for cell lookup
         """
+        self.draw_track_annotations(view, [track], occupancy_grid)
+
+    def draw_track_annotations(self, view: np.ndarray, tracks: List[TrackData], occupancy_grid: OccupancyGrid):
+        """
+        Draw annotations for all tracks, locating their cells in one batch.
+        
+        Args:
+            view: Image to draw on
+            tracks: Tracks to visualize
+            occupancy_grid: Occupancy grid for cell lookup
+        """
+        cells = occupancy_grid.get_cells_for_tracks(tracks)
+        for track, (row, col) in zip(tracks, cells.tolist()):
+            self._draw_track_annotation(view, track, (row, col) if row >= 0 else None)
+
+    def _draw_track_annotation(self, view: np.ndarray, track: TrackData, cell: Optional[tuple]):
+        """
+        Draw track bounding box and ID with a precomputed cell label.
+        
+        Args:
+            view: Image to draw on
+            track: Track to visualize
+            cell: (row, col) of the track's cell, or None
+        """
         x1, y1, x2, y2 = track.bbox
         cv2.rectangle(view, (x1, y1), (x2, y2), self.config.bbox_color, self.config.bbox_thickness)
         id_text = f"ID:{track.track_id}"
-        text_size = cv2.getTextSize(id_text, cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_medium, 2)[0]
+        text_size = self._text_size(id_text, self.config.font_size_medium, 2)
         cv2.rectangle(view, (x1, y1 - 30), (x1 + text_size[0] + 10, y1), self.config.track_id_bg_color, -1)
         cv2.putText(view, id_text, (x1 + 5, y1 - 8), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_medium,
                     self.config.track_id_text_color, 2)
 
         # Draw cell information
-        cell = occupancy_grid.get_cell_for_track(track)
         if cell is not None:
             row, col = cell
             cell_text = f"Cell({row},{col})"
-            cell_size = cv2.getTextSize(cell_text, cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_small, 1)[0]
+            cell_size = self._text_size(cell_text, self.config.font_size_small, 1)
             cv2.rectangle(view, (x1, y2 + 5), (x1 + cell_size[0] + 10, y2 + 25), self.config.cell_label_bg_color, -1)
             cv2.putText(view, cell_text, (x1 + 5, y2 + 18), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_small,
                         self.config.cell_label_text_color, 1)
 
+    def _text_size(self, text: str, scale: float, thickness: int) -> Tuple[int, int]:
+        """Get the (width, height) of a HERSHEY_SIMPLEX label, measuring each distinct label once"""
+        key = (text, scale, thickness)
+        size = self._text_sizes.get(key)
+        if size is None:
+            # Track IDs keep growing, so bound the cache rather than keep every label
+            if len(self._text_sizes) >= TEXT_SIZE_CACHE_LIMIT:
+                self._text_sizes.clear()
+            size = self._text_sizes[key] = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0]
+        return size
+
     def draw_cell_occupancy_overlay(self, view: np.ndarray, geometry_processor: GeometryProcessor,
                                     occupancy_grid: OccupancyGrid):
         """
@@ -118,13 +228,13 @@ class MonitorVisualizer:
             geometry_processor: Geometry processor for coordinate conversion
             occupancy_grid: Occupancy grid with counts
         """
+        centers = occupancy_grid.cell_pixel_centers.tolist()
+        counts = occupancy_grid.ema_counts.tolist()
         for row in range(occupancy_grid.grid_rows):
             for col in range(occupancy_grid.grid_cols):
-                cx_world = (col + 0.5) * self.config.cell_width
-                cy_world = (row + 0.5) * self.config.cell_height
-                cx_img, cy_img = geometry_processor.world_to_image_point(cx_world, cy_world)
+                cx_img, cy_img = centers[row][col]
 
-                count_val = occupancy_grid.ema_counts[row, col]
+                count_val = counts[row][col]
                 occupancy_text = f"{count_val:.1f}/{occupancy_grid.cell_capacity}"
 
                 if count_val > occupancy_grid.cell_capacity:
@@ -137,7 +247,7 @@ class MonitorVisualizer:
                     bg_color = self.config.occupancy_normal_color
                     text_color = self.config.occupancy_normal_text_color
 
-                text_size = cv2.getTextSize(occupancy_text, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+                text_size = self._text_size(occupancy_text, 0.6, 2)
                 padding = 5
 
                 cv2.rectangle(view,
@@ -149,39 +259,109 @@ class MonitorVisualizer:
                             (cx_img - text_size[0] // 2, cy_img + text_size[1] // 2),
                             cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 2)
 
-    def add_basic_info_overlay(self, view: np.ndarray, mode_name: str, fps_counter: list,
-                               fps_start_time: float, show_fps: bool):
+    def add_basic_info_overlay(self, view: np.ndarray, mode_name: str, fps_counter: Sequence[float],
+                               fps_start_time: float, show_fps: bool, scale: float = 1.0):
         """
         Add basic information overlay to view.
         
         Args:
             view: Image to draw on
             mode_name: Current display mode name
-            fps_counter: FPS counter list
+            fps_counter: Recent frame timestamps (rolling window)
             fps_start_time: FPS measurement start time
             show_fps: Whether to show FPS
+            scale: View size relative to the camera frame (e.g. 0.5 for split view tiles)
         """
-        overlay = view.copy()
-        cv2.rectangle(overlay, (10, 10), (350, 80), self.config.info_overlay_bg_color, -1)
-        cv2.putText(overlay, f"Mode: {mode_name}", (20, 30), cv2.FONT_HERSHEY_SIMPLEX,
-                    self.config.font_size_medium, (255, 255, 255), 2)
-        cv2.putText(overlay, f"Resolution: {self.camera_width}x{self.camera_height}", (20, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_tiny, (255, 255, 255), 1)
-
+        def at(x: int, y: int) -> Tuple[int, int]:
+            return self._scaled(x, scale, 0), self._scaled(y, scale, 0)
+
+        # (text, origin, scale, color, thickness)
+        panel_texts = [
+            (f"Mode: {mode_name}", at(20, 30), self.config.font_size_medium * scale, (255, 255, 255),
+             self._scaled(2, scale)),
+            (f"Resolution: {self.camera_width}x{self.camera_height}", at(20, 50), self.config.font_size_tiny * scale,
+             (255, 255, 255), 1),
+        ]
         if show_fps and len(fps_counter) > 5:
-            elapsed = time.time() - fps_start_time
-            fps = len(fps_counter) / max(elapsed, 1)
-            cv2.putText(overlay, f"FPS: {fps:.1f}", (20, 70), cv2.FONT_HERSHEY_SIMPLEX,
-                        self.config.font_size_tiny, (0, 255, 255), 1)
+            fps = compute_fps(fps_counter)
+            panel_texts.append((f"FPS: {fps:.1f}", at(20, 70), self.config.font_size_tiny * scale,
+                                (0, 255, 255), 1))
 
         timestamp = time.strftime("%H:%M:%S")
-        cv2.putText(overlay, timestamp, (10, view.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX,
-                    self.config.font_size_small, (255, 255, 255), 1)
-        cv2.addWeighted(view, 1.0 - self.config.info_overlay_alpha, overlay, self.config.info_overlay_alpha, 0, view)
+        timestamp_text = [(timestamp, (at(10, 0)[0], view.shape[0] - self._scaled(10, scale, 0)),
+                           self.config.font_size_small * scale, (255, 255, 255), 1)]
+
+        # Blend only the regions that are drawn on; elsewhere the blend is an identity
+        panel_rect = (at(10, 10), at(350, 80), self.config.info_overlay_bg_color)
+        panel_box = self._overlay_extent(panel_texts, panel_rect)
+        timestamp_box = self._overlay_extent(timestamp_text)
+        if self._boxes_overlap(panel_box, timestamp_box):
+            # Small views: one blend so overlapping areas are not blended twice
+            union = (min(panel_box[0], timestamp_box[0]), min(panel_box[1], timestamp_box[1]),
+                     max(panel_box[2], timestamp_box[2]), max(panel_box[3], timestamp_box[3]))
+            self._blend_overlay_region(view, union, panel_texts + timestamp_text, panel_rect)
+        else:
+            self._blend_overlay_region(view, panel_box, panel_texts, panel_rect)
+            self._blend_overlay_region(view, timestamp_box, timestamp_text)
+
+    @staticmethod
+    def _overlay_extent(texts: list, rect: Optional[tuple] = None) -> Tuple[int, int, int, int]:
+        """
+        Bounding box (x0, y0, x1, y1) of a filled rectangle and text items.
+        
+        Args:
+            texts: List of (text, origin, scale, color, thickness)
+            rect: Optional ((x1, y1), (x2, y2), color) filled rectangle
+            
+        Returns:
+            Exclusive bounding box covering everything that would be drawn
+        """
+        boxes = []
+        if rect is not None:
+            (rx1, ry1), (rx2, ry2), _ = rect
+            boxes.append((rx1, ry1, rx2 + 1, ry2 + 1))
+        for text, (tx, ty), scale, _, thickness in texts:
+            (tw, th), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            pad = thickness + 2
+            boxes.append((tx - pad, ty - th - pad, tx + tw + pad, ty + baseline + pad))
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    @staticmethod
+    def _boxes_overlap(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+        """Whether two exclusive (x0, y0, x1, y1) boxes intersect"""
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+    def _blend_overlay_region(self, view: np.ndarray, box: Tuple[int, int, int, int], texts: list,
+                              rect: Optional[tuple] = None):
+        """
+        Draw a filled rectangle and text translucently, touching only the given region.
+        
+        Args:
+            view: Image to draw on
+            box: Region (x0, y0, x1, y1) containing everything drawn
+            texts: List of (text, origin, scale, color, thickness)
+            rect: Optional ((x1, y1), (x2, y2), color) filled background rectangle
+        """
+        x0, y0 = max(0, box[0]), max(0, box[1])
+        x1, y1 = min(view.shape[1], box[2]), min(view.shape[0], box[3])
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        roi = view[y0:y1, x0:x1]
+        overlay = roi.copy()
+        if rect is not None:
+            (rx1, ry1), (rx2, ry2), color = rect
+            cv2.rectangle(overlay, (rx1 - x0, ry1 - y0), (rx2 - x0, ry2 - y0), color, -1)
+        for text, (tx, ty), scale, color, thickness in texts:
+            cv2.putText(overlay, text, (tx - x0, ty - y0), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+
+        alpha = self.config.info_overlay_alpha
+        cv2.addWeighted(roi, 1.0 - alpha, overlay, alpha, 0, roi)
 
     def create_info_panel(self, width: int, tracks: List[TrackData], occupancy_grid: OccupancyGrid,
-                          frame_count: int, display_mode: str, tracker, fps_counter: list,
-                          fps_start_time: float, show_fps: bool) -> np.ndarray:
+                          frame_count: int, display_mode: str, tracker, fps_counter: Sequence[float],
+                          fps_start_time: float, show_fps: bool, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Create comprehensive information panel for monitoring view.
         
@@ -192,21 +372,58 @@ class MonitorVisualizer:
             frame_count: Current frame count
             display_mode: Current display mode
             tracker: Tracker instance
-            fps_counter: FPS counter list
+            fps_counter: Recent frame timestamps (rolling window)
             fps_start_time: FPS measurement start time
             show_fps: Whether to show FPS
+            out: Optional (info_panel_height, width, 3) buffer to draw into
             
         Returns:
             Information panel image
         """
         panel_height = self.config.info_panel_height
-        panel = np.zeros((panel_height, width, 3), dtype=np.uint8)
-        panel[:] = self.config.info_panel_background_color
+        panel = out if out is not None else np.empty((panel_height, width, 3), dtype=np.uint8)
 
+        # Everything but the frame/FPS line changes rarely, so it is rendered only on change
         total_people = len(tracks)
-        total_capacity = occupancy_grid.grid_rows * occupancy_grid.grid_cols * occupancy_grid.cell_capacity
-        alert_count = int(np.sum(occupancy_grid.notified))
+        alert_count = int(np.count_nonzero(occupancy_grid.notified))
+        tracker_type = "DeepSort" if isinstance(tracker, DeepSortTracker) else "Centroid"
+        key = (width, panel_height, total_people, alert_count, tracker_type,
+               occupancy_grid.grid_rows, occupancy_grid.grid_cols, occupancy_grid.cell_capacity,
+               self.config.cell_width, self.config.cell_height)
+        if key != self._info_panel_key:
+            self._info_panel = self._render_info_panel_static(width, total_people, alert_count,
+                                                              tracker_type, occupancy_grid)
+            self._info_panel_key = key
+        np.copyto(panel, self._info_panel)
 
+        perf_text = f"Frame: {frame_count} | Mode: {display_mode}"
+        if show_fps and len(fps_counter) > 5:
+            fps = compute_fps(fps_counter)
+            perf_text += f" | FPS: {fps:.1f}"
+        cv2.putText(panel, perf_text, (10, 75), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_small,
+                    (180, 180, 180), 1)
+
+        return panel
+
+    def _render_info_panel_static(self, width: int, total_people: int, alert_count: int, tracker_type: str,
+                                  occupancy_grid: OccupancyGrid) -> np.ndarray:
+        """
+        Render the info panel background and its slowly changing text lines.
+        
+        Args:
+            width: Panel width
+            total_people: Number of current tracks
+            alert_count: Number of cells in alert
+            tracker_type: Tracker name shown in the panel
+            occupancy_grid: Occupancy grid
+            
+        Returns:
+            Panel image without the frame/FPS line
+        """
+        panel = np.empty((self.config.info_panel_height, width, 3), dtype=np.uint8)
+        panel[:] = self.config.info_panel_background_color
+
+        total_capacity = occupancy_grid.grid_rows * occupancy_grid.grid_cols * occupancy_grid.cell_capacity
         info_text = (f"People: {total_people} | Capacity: {total_capacity} | "
                      f"Grid: {occupancy_grid.grid_rows}x{occupancy_grid.grid_cols} | "
                      f"Cell: {self.config.cell_width:.1f}x{self.config.cell_height:.1f}m")
@@ -222,19 +439,10 @@ class MonitorVisualizer:
             cv2.putText(panel, status_text, (10, 50), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_medium,
                         (0, 255, 0), 1)
 
-        perf_text = f"Frame: {frame_count} | Mode: {display_mode}"
-        if show_fps and len(fps_counter) > 5:
-            elapsed = time.time() - fps_start_time
-            fps = len(fps_counter) / max(elapsed, 1)
-            perf_text += f" | FPS: {fps:.1f}"
-        cv2.putText(panel, perf_text, (10, 75), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_small,
-                    (180, 180, 180), 1)
-
         controls_text = "Controls: 1-5 (modes) | s (screenshot) | g (grid) | r (reset) | f (fps) | q (quit)"
         cv2.putText(panel, controls_text, (10, 95), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_tiny,
                     (120, 120, 120), 1)
 
-        tracker_type = "DeepSort" if isinstance(tracker, DeepSortTracker) else "Centroid"
         tracker_text = f"Tracker: {tracker_type}"
         cv2.putText(panel, tracker_text, (10, 115), cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_tiny,
                     (180, 180, 180), 1)
@@ -260,7 +468,7 @@ class MonitorVisualizer:
         view_width = int(occupancy_grid.world_width * scale)
         view_height = int(occupancy_grid.world_height * scale)
 
-        view = np.zeros((view_height, view_width, 3), dtype=np.uint8) + self.config.birdseye_background_value
+        view = np.empty((view_height, view_width, 3), dtype=np.uint8)
 
         self._draw_occupancy_heatmap(view, scale, occupancy_grid)
         self._draw_birdseye_grid(view, scale, occupancy_grid)
@@ -271,95 +479,230 @@ class MonitorVisualizer:
 
         return view
 
+    def _get_birdseye_axes(self, scale: float, occupancy_grid: OccupancyGrid) -> Tuple[list, list, list, list]:
+        """
+        Get bird's eye pixel coordinates of cell edges and centers.
+        
+        Args:
+            scale: Pixels per meter
+            occupancy_grid: Occupancy grid for dimensions
+            
+        Returns:
+            Tuple of (col_edges, row_edges, col_centers, row_centers) as int lists
+        """
+        cols, rows = occupancy_grid.grid_cols, occupancy_grid.grid_rows
+        cell_w, cell_h = self.config.cell_width, self.config.cell_height
+        key = (rows, cols, cell_w, cell_h, scale)
+        if key != self._birdseye_axes_key:
+            self._birdseye_axes = (
+                (np.arange(cols + 1) * cell_w * scale).astype(np.int64).tolist(),
+                (np.arange(rows + 1) * cell_h * scale).astype(np.int64).tolist(),
+                ((np.arange(cols) + 0.5) * cell_w * scale).astype(np.int64).tolist(),
+                ((np.arange(rows) + 0.5) * cell_h * scale).astype(np.int64).tolist(),
+            )
+            self._birdseye_axes_key = key
+        return self._birdseye_axes
+
+    def _get_birdseye_cell_index(self, shape: Tuple[int, ...], scale: float,
+                                 occupancy_grid: OccupancyGrid) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the grid row of every bird's eye pixel row and the grid column of every pixel column.
+        
+        Args:
+            shape: Shape of the bird's eye view
+            scale: Pixels per meter
+            occupancy_grid: Occupancy grid for dimensions
+            
+        Returns:
+            Tuple of (row_index, col_index); pixels outside all cells map to grid_rows/grid_cols
+        """
+        axes = self._get_birdseye_axes(scale, occupancy_grid)
+        key = (shape[:2], axes)
+        if key != self._birdseye_index_key:
+            col_edges, row_edges, _, _ = axes
+            height, width = shape[:2]
+            self._birdseye_index = (self._edges_to_pixel_index(row_edges, height),
+                                    self._edges_to_pixel_index(col_edges, width))
+            self._birdseye_index_key = key
+        return self._birdseye_index
+
+    @staticmethod
+    def _edges_to_pixel_index(edges: list, size: int) -> np.ndarray:
+        """Map pixels along one axis to the last cell whose inclusive [edge, next edge] span covers them"""
+        index = np.full(size, len(edges) - 1, dtype=np.intp)
+        for cell, (start, end) in enumerate(zip(edges[:-1], edges[1:])):
+            start = max(0, min(size - 1, start))
+            end = max(0, min(size, end))
+            if end > start:
+                index[start:end + 1] = cell
+        return index
+
     def _draw_occupancy_heatmap(self, view: np.ndarray, scale: float, occupancy_grid: OccupancyGrid):
-        """Draw occupancy heat map on bird's eye view"""
-        overlay = np.zeros_like(view)
+        """
+        Fill a bird's eye view with the background and occupancy heat map.
+        
+        The blended result is cached; each frame only cells whose color changed are refilled.
+        
+        Args:
+            view: Bird's eye view to fill (previous contents are ignored)
+            scale: Pixels per meter
+            occupancy_grid: Occupancy grid with counts
+        """
+        row_index, col_index = self._get_birdseye_cell_index(view.shape, scale, occupancy_grid)
+        alpha = self.config.birdseye_overlay_alpha
+        background = self.config.birdseye_background_value
+        key = (self._birdseye_index_key, alpha, background)
+        if key != self._heatmap_key:
+            self._heatmap = np.empty(view.shape, dtype=np.uint8)
+            self._heatmap_lut_index = None
+            # Pixel spans of each cell (indices are non-decreasing; outside-grid pixels come last)
+            self._heatmap_row_spans = (np.searchsorted(row_index, np.arange(occupancy_grid.grid_rows + 1)),
+                                       np.searchsorted(row_index, np.arange(occupancy_grid.grid_rows + 1),
+                                                       side='right'))
+            self._heatmap_col_spans = (np.searchsorted(col_index, np.arange(occupancy_grid.grid_cols + 1)),
+                                       np.searchsorted(col_index, np.arange(occupancy_grid.grid_cols + 1),
+                                                       side='right'))
+            self._heatmap_key = key
+
+        lut_index = self._occupancy_lut_index(occupancy_grid.ema_counts, occupancy_grid.cell_capacity)
+        if self._heatmap_lut_index is None or self._heatmap_lut_index.shape != lut_index.shape:
+            # Full render: blend one color per cell (plus the black outside-grid entry) and expand
+            colors = np.zeros((occupancy_grid.grid_rows + 1, occupancy_grid.grid_cols + 1, 3), dtype=np.uint8)
+            colors[:-1, :-1] = self._occ_lut[lut_index]
+            blended = self._blend_heatmap_colors(colors, alpha, background)
+            np.copyto(self._heatmap, blended[row_index[:, None], col_index[None, :]])
+        else:
+            dirty = np.argwhere(lut_index != self._heatmap_lut_index)
+            if len(dirty):
+                blended = self._blend_heatmap_colors(self._occ_lut[lut_index[dirty[:, 0], dirty[:, 1]]][None],
+                                                     alpha, background)[0]
+                row_starts, row_stops = self._heatmap_row_spans
+                col_starts, col_stops = self._heatmap_col_spans
+                for (row, col), color in zip(dirty.tolist(), blended):
+                    self._heatmap[row_starts[row]:row_stops[row], col_starts[col]:col_stops[col]] = color
+        self._heatmap_lut_index = lut_index
+
+        np.copyto(view, self._heatmap)
+
+    @staticmethod
+    def _blend_heatmap_colors(colors: np.ndarray, alpha: float, background: int) -> np.ndarray:
+        """Blend heat map colors over the uniform bird's eye background"""
+        return cv2.addWeighted(colors, alpha, np.full_like(colors, background), 1.0 - alpha, 0)
+
+    def _occupancy_lut_index(self, occupancy: np.ndarray, cell_capacity: int) -> np.ndarray:
+        """Map occupancy levels to occupancy color LUT entries"""
+        # Entry i covers fractions in ((i - 1) / steps, i / steps], matching the strict thresholds
+        index = np.ceil(np.multiply(occupancy, OCCUPANCY_LUT_STEPS / cell_capacity, dtype=np.float64))
+        np.clip(index, 0, len(self._occ_lut) - 1, out=index)
+        return index.astype(np.intp)
+
+    @staticmethod
+    def _get_occupancy_colors(occupancy: np.ndarray, cell_capacity: int) -> np.ndarray:
+        """
+        Get BGR colors for an array of occupancy levels.
+        
+        Args:
+            occupancy: Occupancy values of any shape
+            cell_capacity: Cell capacity
+            
+        Returns:
+            uint8 array of shape occupancy.shape + (3,)
+        """
+        occupancy = np.asarray(occupancy, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            over = np.minimum(255, (150 + 105 * np.minimum(1.0, occupancy / cell_capacity - 1)).astype(np.int64))
+        fraction = occupancy / max(1.0, cell_capacity)
+        t_high = (fraction - 0.8) / 0.2
+        t_med = (fraction - 0.5) / 0.3
+        t_low = (fraction - 0.1) / 0.4
 
+        conditions = [occupancy > cell_capacity, fraction > 0.8, fraction > 0.5, fraction > 0.1]
+        zero = np.zeros_like(occupancy)
+        blue = np.select(conditions, [zero, zero, 100 * t_med, zero], 100)
+        green = np.select(conditions, [zero, 165 + 90 * t_high, 255, 80 + 175 * t_low], 60)
+        red = np.select(conditions, [over, 255 - 100 * t_high, 100 * t_med, zero], 40)
+        return np.stack((blue, green, red), axis=-1).astype(np.uint8)
+
+    def _draw_birdseye_grid(self, view: np.ndarray, scale: float, occupancy_grid: OccupancyGrid):
+        """Draw grid lines on bird's eye view"""
+        key = (view.shape, self._get_birdseye_axes(scale, occupancy_grid),
+               tuple(self.config.birdseye_grid_color), self.config.font_size_birdseye)
+        if key != self._birdseye_skeleton_key:
+            self._birdseye_skeleton, self._birdseye_skeleton_mask = self._render_birdseye_skeleton(
+                view.shape, scale, occupancy_grid)
+            self._birdseye_skeleton_key = key
+        cv2.copyTo(self._birdseye_skeleton, self._birdseye_skeleton_mask, view)
+
+        # Only the counts and alert boxes change between frames
+        _, _, col_centers, row_centers = self._get_birdseye_axes(scale, occupancy_grid)
+        counts = occupancy_grid.ema_counts.tolist()
+        notified = occupancy_grid.notified
         for row in range(occupancy_grid.grid_rows):
+            center_y = row_centers[row]
             for col in range(occupancy_grid.grid_cols):
-                x1 = int(col * self.config.cell_width * scale)
-                y1 = int(row * self.config.cell_height * scale)
-                x2 = int((col + 1) * self.config.cell_width * scale)
-                y2 = int((row + 1) * self.config.cell_height * scale)
-
-                x1 = max(0, min(view.shape[1] - 1, x1))
-                x2 = max(0, min(view.shape[1], x2))
-                y1 = max(0, min(view.shape[0] - 1, y1))
-                y2 = max(0, min(view.shape[0], y2))
+                center_x = col_centers[col]
 
-                if x2 <= x1 or y2 <= y1:
-                    continue
-
-                count = occupancy_grid.ema_counts[row, col]
-                color = self._get_occupancy_color(count, occupancy_grid.cell_capacity)
-                cv2.rectangle(overlay, (x1, y1), (x2, y2), color, -1)
-
-        cv2.addWeighted(overlay, self.config.birdseye_overlay_alpha, view,
-                        1.0 - self.config.birdseye_overlay_alpha, 0, view)
-
-    def _get_occupancy_color(self, occupancy: float, cell_capacity: int) -> Tuple[int, int, int]:
-        """Get color for occupancy level"""
-        if occupancy > cell_capacity:
-            intensity = min(255, int(150 + 105 * min(1.0, (occupancy / cell_capacity - 1))))
-            return (0, 0, intensity)
-
-        fraction = occupancy / max(1.0, cell_capacity)
+                count_text = f"{counts[row][col]:.1f}"
+                cv2.putText(view, count_text, (center_x - 15, center_y + 5),
+                            cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_tiny, (255, 255, 255), 1)
 
-        if fraction > 0.8:
-            t = (fraction - 0.8) / 0.2
-            return (0, int(165 + 90 * t), int(255 - 100 * t))
-        elif fraction > 0.5:
-            t = (fraction - 0.5) / 0.3
-            return (int(100 * t), 255, int(100 * t))
-        elif fraction > 0.1:
-            t = (fraction - 0.1) / 0.4
-            return (0, int(80 + 175 * t), 0)
-        else:
-            return (100, 60, 40)
+                if notified[row, col]:
+                    cv2.rectangle(view, (center_x - 20, center_y - 15), (center_x + 20, center_y + 15),
+                                  self.config.birdseye_alert_box_color, 2)
 
-    def _draw_birdseye_grid(self, view: np.ndarray, scale: float, occupancy_grid: OccupancyGrid):
-        """Draw grid lines on bird's eye view"""
+    def _render_birdseye_skeleton(self, shape: Tuple[int, ...], scale: float,
+                                  occupancy_grid: OccupancyGrid) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rasterize the static bird's eye gridlines and cell coordinate labels once.
+        
+        Args:
+            shape: Shape of the bird's eye view
+            scale: Pixels per meter
+            occupancy_grid: Occupancy grid for dimensions
+            
+        Returns:
+            Tuple of (layer, mask of drawn pixels)
+        """
+        layer = np.zeros(shape, dtype=np.uint8)
+        mask = np.zeros(shape[:2], dtype=np.uint8)
         grid_color = self.config.birdseye_grid_color
+        col_edges, row_edges, col_centers, row_centers = self._get_birdseye_axes(scale, occupancy_grid)
+        height, width = shape[:2]
 
-        for col in range(occupancy_grid.grid_cols + 1):
-            x = int(col * self.config.cell_width * scale)
-            if 0 <= x < view.shape[1]:
-                cv2.line(view, (x, 0), (x, view.shape[0] - 1), grid_color, 1)
+        for target, color in ((layer, grid_color), (mask, 255)):
+            for x in col_edges:
+                if 0 <= x < width:
+                    cv2.line(target, (x, 0), (x, height - 1), color, 1)
 
-        for row in range(occupancy_grid.grid_rows + 1):
-            y = int(row * self.config.cell_height * scale)
-            if 0 <= y < view.shape[0]:
-                cv2.line(view, (0, y), (view.shape[1] - 1, y), grid_color, 1)
+            for y in row_edges:
+                if 0 <= y < height:
+                    cv2.line(target, (0, y), (width - 1, y), color, 1)
 
         for row in range(occupancy_grid.grid_rows):
+            center_y = row_centers[row]
             for col in range(occupancy_grid.grid_cols):
-                center_x = int((col + 0.5) * self.config.cell_width * scale)
-                center_y = int((row + 0.5) * self.config.cell_height * scale)
-
+                org = (col_centers[col] - 25, center_y - 10)
                 coord_text = f"({row},{col})"
-                cv2.putText(view, coord_text, (center_x - 25, center_y - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_birdseye, (200, 200, 200), 1)
-
-                count_text = f"{occupancy_grid.ema_counts[row, col]:.1f}"
-                cv2.putText(view, count_text, (center_x - 15, center_y + 5),
-                            cv2.FONT_HERSHEY_SIMPLEX, self.config.font_size_tiny, (255, 255, 255), 1)
+                cv2.putText(layer, coord_text, org, cv2.FONT_HERSHEY_SIMPLEX,
+                            self.config.font_size_birdseye, (200, 200, 200), 1)
+                cv2.putText(mask, coord_text, org, cv2.FONT_HERSHEY_SIMPLEX,
+                            self.config.font_size_birdseye, 255, 1)
 
-                if occupancy_grid.notified[row, col]:
-                    cv2.rectangle(view, (center_x - 20, center_y - 15), (center_x + 20, center_y + 15),
-                                  self.config.birdseye_alert_box_color, 2)
+        return layer, mask
 
     def _draw_birdseye_tracks(self, view: np.ndarray, tracks: List[TrackData], scale: float,
                               geometry_processor: GeometryProcessor):
         """Draw person positions on bird's eye view"""
-        for track in tracks:
-            polygon, _ = geometry_processor.project_bbox_to_world(track.bbox)
-            if polygon is None:
-                continue
+        if not tracks:
+            return
 
-            centroid = polygon.centroid
-            px = int(centroid.x * scale)
-            py = int(centroid.y * scale)
+        world_quads = geometry_processor.project_bboxes_to_world(
+            np.array([track.bbox for track in tracks], dtype=np.float32))
+        if world_quads is None:
+            return
 
+        centroids = (geometry_processor.quad_centroids(world_quads) * scale).astype(np.int32)
+        for track, (px, py) in zip(tracks, centroids.tolist()):
             if 0 <= px < view.shape[1] and 0 <= py < view.shape[0]:
                 cv2.circle(view, (px, py), self.config.birdseye_person_radius,
                            self.config.birdseye_person_color, -1)
@@ -15,9 +15,10 @@ import time
 import uuid
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Optional, Sequence, TYPE_CHECKING
 
 from config import DEFAULT_WEBSOCKET_DEVICE_ID, DEFAULT_WEBSOCKET_DEVICE_NAME
+from fps_utils import compute_fps
 from logger_config import get_logger
 
 if TYPE_CHECKING:
@@ -126,7 +127,7 @@ def build_payload(
         tracks: "List[TrackData]",
         occupancy_grid: "OccupancyGrid",
         frame_count: int,
-        fps_counter: list,
+        fps_counter: Sequence[float],
         fps_start_time: float,
         config: "MonitoringConfig",
 ) -> MonitoringPayload:
@@ -137,7 +138,7 @@ def build_payload(
         tracks:          Active TrackData objects from the tracker.
         occupancy_grid:  OccupancyGrid instance (post-update).
         frame_count:     Current frame index.
-        fps_counter:     Rolling list of frame timestamps used for FPS calc.
+        fps_counter:     Rolling window of frame timestamps used for FPS calc.
         fps_start_time:  Session start time (unused but kept for compat).
         config:          MonitoringConfig (provides WS device meta-data).
 
@@ -167,11 +168,7 @@ def build_payload(
     )
 
     # ── FPS ────────────────────────────────────────────────────────────
-    if len(fps_counter) > 1:
-        elapsed = fps_counter[-1] - fps_counter[0]
-        fps = len(fps_counter) / elapsed if elapsed > 0 else 0.0
-    else:
-        fps = 0.0
+    fps = compute_fps(fps_counter)
 
     # ── Tracked persons ────────────────────────────────────────────────
     tracked_persons: List[PersonTrackPayload] = []